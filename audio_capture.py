@@ -0,0 +1,247 @@
+import math
+import time
+import wave
+import queue
+import threading
+from array import array
+from collections import deque
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+FRAME_MS = 30
+
+
+class MicrophoneSource:
+    """One PyAudio input stream kept open for the whole session."""
+
+    def __init__(self, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS, device_index=None):
+        import pyaudio
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.audio = pyaudio.PyAudio()
+        self.stream = self.audio.open(format=pyaudio.paInt16, channels=1, rate=sample_rate,
+                                      input=True, frames_per_buffer=self.frame_samples,
+                                      input_device_index=device_index)
+
+    def read(self):
+        return self.stream.read(self.frame_samples, exception_on_overflow=False)
+
+    def close(self):
+        self.stream.stop_stream()
+        self.stream.close()
+        self.audio.terminate()
+
+
+class WavSource:
+    """Reads 16-bit mono WAV frames, optionally at real-time pace. Returns None at EOF."""
+
+    def __init__(self, path, frame_ms=FRAME_MS, realtime=False):
+        self.wav = wave.open(path, "rb")
+        if self.wav.getsampwidth() != SAMPLE_WIDTH or self.wav.getnchannels() != 1:
+            raise ValueError("WavSource expects 16-bit mono audio")
+        self.sample_rate = self.wav.getframerate()
+        self.frame_samples = self.sample_rate * frame_ms // 1000
+        self.realtime = realtime
+
+    def read(self):
+        data = self.wav.readframes(self.frame_samples)
+        if len(data) < self.frame_samples * SAMPLE_WIDTH:
+            return None
+        if self.realtime:
+            time.sleep(self.frame_samples / self.sample_rate)
+        return data
+
+    def close(self):
+        self.wav.close()
+
+
+class SyntheticSource:
+    """Serves frames from an iterable of 16-bit samples, e.g. synthetic_speech()."""
+
+    def __init__(self, samples, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS, realtime=False):
+        self.samples = iter(samples)
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.realtime = realtime
+
+    def read(self):
+        frame = array("h")
+        for sample in self.samples:
+            frame.append(sample)
+            if len(frame) == self.frame_samples:
+                break
+        if len(frame) < self.frame_samples:
+            return None
+        if self.realtime:
+            time.sleep(self.frame_samples / self.sample_rate)
+        return frame.tobytes()
+
+    def close(self):
+        pass
+
+
+def synthetic_speech(segments, sample_rate=SAMPLE_RATE, noise=200, seed=1):
+    """Generate PCM samples from (seconds, amplitude[, hz]) segments; amplitude 0 is background noise."""
+    state = seed
+    for segment in segments:
+        seconds, amplitude = segment[:2]
+        frequency = segment[2] if len(segment) > 2 else 220
+        for n in range(int(seconds * sample_rate)):
+            # Cheap deterministic noise so runs are reproducible
+            state = (state * 1103515245 + 12345) & 0x7FFFFFFF
+            value = (state / 0x7FFFFFFF * 2 - 1) * noise
+            if amplitude:
+                value += amplitude * math.sin(2 * math.pi * frequency * n / sample_rate)
+            yield max(-32768, min(32767, int(value)))
+
+
+def frame_rms(frame):
+    samples = array("h", frame)
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class EnergyVAD:
+    """Energy detector with a noise floor that adapts slowly during non-speech.
+
+    The floor is also never below the quietest frame of the last ``floor_window`` frames, so a
+    step up in room noise (which itself reads as speech) raises it within a few seconds.
+    """
+
+    def __init__(self, ratio=3.0, min_energy=300.0, adapt_rate=0.05, initial_floor=100.0, floor_window=100):
+        self.ratio = ratio
+        self.min_energy = min_energy
+        self.adapt_rate = adapt_rate
+        self.noise_floor = initial_floor
+        self.recent = deque(maxlen=floor_window)
+
+    def is_speech(self, frame):
+        energy = frame_rms(frame)
+        self.recent.append(energy)
+        if len(self.recent) == self.recent.maxlen:
+            self.noise_floor = max(self.noise_floor, min(self.recent))
+        speech = energy > max(self.noise_floor * self.ratio, self.min_energy)
+        if not speech:
+            self.noise_floor += (energy - self.noise_floor) * self.adapt_rate
+        return speech
+
+    def calibrate(self, frames):
+        # Median, so a word spoken during calibration doesn't raise the floor
+        energies = sorted(frame_rms(frame) for frame in frames)
+        if energies:
+            self.noise_floor = energies[len(energies) // 2]
+
+
+class Utterance:
+    def __init__(self, data, sample_rate, started, ended):
+        self.data = data
+        self.sample_rate = sample_rate
+        self.sample_width = SAMPLE_WIDTH
+        self.started = started
+        self.ended = ended
+
+    def duration(self):
+        return len(self.data) / (self.sample_rate * self.sample_width)
+
+    def to_audio_data(self):
+        import speech_recognition as sr
+        return sr.AudioData(self.data, self.sample_rate, self.sample_width)
+
+
+class AudioCapture:
+    """Reads a source continuously into a ring buffer and emits utterance segments to a queue."""
+
+    def __init__(self, source, vad=None, buffer_seconds=10, preroll_ms=300, start_ms=90,
+                 hangover_ms=600, max_utterance_seconds=15, queue_size=8, on_speech_start=None):
+        self.source = source
+        self.on_speech_start = on_speech_start
+        self.vad = vad or EnergyVAD()
+        frame_ms = source.frame_samples * 1000 // source.sample_rate
+        self.frame_ms = frame_ms
+        self.ring = deque(maxlen=max(1, buffer_seconds * 1000 // frame_ms))
+        self.preroll_frames = max(1, preroll_ms // frame_ms)
+        self.start_frames = max(1, start_ms // frame_ms)
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.max_frames = max_utterance_seconds * 1000 // frame_ms
+        self.utterances = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.running = False
+        self.finished = threading.Event()
+        self.thread = None
+
+    def calibrate(self, ms=500):
+        """Measure room noise for the VAD before listening starts."""
+        frames = []
+        for _ in range(max(1, ms // self.frame_ms)):
+            frame = self.source.read()
+            if frame is None:
+                break
+            self.ring.append(frame)
+            frames.append(frame)
+        self.vad.calibrate(frames)
+        return self
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+        self.source.close()
+
+    def get(self, timeout=None):
+        return self.utterances.get(timeout=timeout)
+
+    def recent_audio(self, seconds):
+        frames = list(self.ring)
+        count = int(seconds * self.source.sample_rate / self.source.frame_samples)
+        return b"".join(frames[-count:]) if count else b""
+
+    def _emit(self, frames, started):
+        utterance = Utterance(b"".join(frames), self.source.sample_rate, started, time.monotonic())
+        try:
+            self.utterances.put_nowait(utterance)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        voiced_run = 0
+        silent_run = 0
+        segment = None
+        started = None
+        try:
+            while self.running:
+                frame = self.source.read()
+                if frame is None:
+                    break
+                self.ring.append(frame)
+                speech = self.vad.is_speech(frame)
+
+                if segment is None:
+                    voiced_run = voiced_run + 1 if speech else 0
+                    if voiced_run >= self.start_frames:
+                        # Include the frames just before onset so the first syllable is kept
+                        count = min(len(self.ring), self.preroll_frames + voiced_run)
+                        segment = list(self.ring)[-count:]
+                        started = time.monotonic()
+                        silent_run = 0
+                        if self.on_speech_start:
+                            self.on_speech_start()
+                    continue
+
+                segment.append(frame)
+                silent_run = 0 if speech else silent_run + 1
+                if silent_run >= self.hangover_frames or len(segment) >= self.max_frames:
+                    self._emit(segment, started)
+                    segment = None
+                    voiced_run = 0
+            if segment:
+                self._emit(segment, started)
+        finally:
+            self.running = False
+            self.finished.set()
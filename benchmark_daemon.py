@@ -0,0 +1,101 @@
+import sys
+import time
+import argparse
+import threading
+import statistics
+from daemon_client import DaemonClient, DaemonBusyError, DaemonError
+from benchmark_intents import CORPUS
+
+# Commands only: against a real daemon these run their actions (browser tabs, screenshots) on the host
+COMMANDS = [text for text, intent, _ in CORPUS if intent not in ("exit", "screenshot", "screenshot_burst")]
+
+
+def client_loop(url, client_id, count, result, lock):
+    client = DaemonClient(url, client_id=client_id)
+    for i in range(count):
+        text = COMMANDS[i % len(COMMANDS)]
+        while True:
+            start = time.perf_counter()
+            try:
+                client.command(text, speak=False)
+            except DaemonBusyError as e:
+                with lock:
+                    result["rejected"] += 1
+                time.sleep(min(e.retry_after, 0.05))
+                continue
+            except DaemonError:
+                with lock:
+                    result["errors"] += 1
+                break
+            with lock:
+                result["latencies"].append((time.perf_counter() - start) * 1000)
+            break
+    with lock:
+        result["finished"] = max(result["finished"], time.perf_counter())
+    client.close()
+
+
+def print_row(label, result, start):
+    elapsed = result["finished"] - start
+    latencies = sorted(result["latencies"])
+    pick = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))]
+    print(f"{label:>8}{len(latencies) / elapsed:>10.0f}{statistics.median(latencies):>9.1f}"
+          f"{pick(95):>9.1f}{pick(99):>9.1f}{result['rejected']:>8}{result['errors']:>8}")
+
+
+def run_level(url, clients, per_client, noisy=0):
+    lock = threading.Lock()
+    results = {group: {"latencies": [], "rejected": 0, "errors": 0, "finished": 0.0} for group in ("clients", "noisy")}
+    threads = [threading.Thread(target=client_loop, args=(url, f"load{i}", per_client, results["clients"], lock))
+               for i in range(clients)]
+    # One client id sending from many connections at once; its queue fills, the others' should not
+    threads += [threading.Thread(target=client_loop, args=(url, "noisy", per_client, results["noisy"], lock))
+                for _ in range(noisy)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print_row(str(clients), results["clients"], start)
+    if noisy:
+        print_row("noisy", results["noisy"], start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent clients against the daemon's command API.")
+    parser.add_argument("--url", help="running daemon to load (default: an in-process daemon with stand-ins)")
+    parser.add_argument("--clients", default="1,4,16,64", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=50, help="commands per client")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=8)
+    parser.add_argument("--noisy", type=int, default=32, help="connections for the flooding client")
+    parser.add_argument("--llm-token-delay", type=float, default=0.001)
+    args = parser.parse_args(argv)
+
+    harness = daemon = None
+    url = args.url
+    if url is None:
+        from benchmark_replay import Harness
+        from daemon import TwilightDaemon, CommandEngine
+        harness = Harness(llm_token_delay=args.llm_token_delay)
+        daemon = TwilightDaemon(port=0, engine=CommandEngine(args.workers, args.max_pending)).start()
+        url = daemon.url
+    try:
+        print(f"{'clients':>8}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'429s':>8}{'errors':>8}")
+        for clients in (int(c) for c in args.clients.split(",")):
+            run_level(url, clients, args.requests)
+        if args.noisy:
+            print(f"4 clients next to one client sending on {args.noisy} connections")
+            run_level(url, 4, args.requests, args.noisy)
+        stats = DaemonClient(url, client_id="benchmark").stats()
+        print(f"completed {stats['completed']}, rejected {stats['rejected']}")
+        print(f"daemon-side latency ms {stats['latency_ms']}")
+    finally:
+        if daemon:
+            daemon.stop()
+            harness.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import sys
+import math
+import timeit
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QPainterPath
+from sphere_geometry import RingGeometry, np
+
+RING_RADIUS = 110
+CENTER = 250
+
+
+def legacy_rings(time):
+    # The per-frame loop PlasmaSphereWidget.paintEvent used before RingGeometry
+    paths = []
+    for i in range(8):
+        rotation = time * 0.5 + i * 22.5
+        path = QPainterPath()
+        points = []
+        for angle in range(0, 360, 3):
+            rad = math.radians(angle)
+            x_base = RING_RADIUS * math.cos(rad)
+            y_base = RING_RADIUS * 0.3 * math.sin(rad)
+            rot_rad = math.radians(rotation)
+            x = CENTER + x_base * math.cos(rot_rad) - y_base * math.sin(rot_rad)
+            y = CENTER + x_base * math.sin(rot_rad) + y_base * math.cos(rot_rad)
+            points.append((x, y))
+        path.moveTo(points[0][0], points[0][1])
+        for j in range(1, len(points)):
+            path.lineTo(points[j][0], points[j][1])
+        path.closeSubpath()
+        paths.append(path)
+    return paths
+
+
+def check_matches_legacy(geometry):
+    for time in (0, 45, 137, 359):
+        for path, polygon in zip(legacy_rings(time), geometry.polygons(time, CENTER, CENTER)):
+            expected = path.toFillPolygon()
+            for j in range(polygon.count()):
+                a, b = expected.at(j), polygon.at(j)
+                if abs(a.x() - b.x()) > 1e-6 or abs(a.y() - b.y()) > 1e-6:
+                    raise SystemExit(f"geometry mismatch at time={time} point={j}")
+
+
+def run(frames=360, repeat=3):
+    def frame_loop(fn):
+        def loop():
+            for time in range(frames):
+                fn(time)
+        return loop
+
+    variants = [("legacy loop", frame_loop(legacy_rings))]
+    for label, use_numpy in (("numpy", True), ("pure python", False)):
+        if use_numpy and np is None:
+            continue
+        geometry = RingGeometry(RING_RADIUS, use_numpy=use_numpy)
+        check_matches_legacy(geometry)
+        variants.append((f"{label}, first pass", frame_loop(
+            lambda t, g=geometry: (g.clear(), g.polygons(t, CENTER, CENTER)))))
+        geometry.clear()
+        frame_loop(lambda t, g=geometry: g.polygons(t, CENTER, CENTER))()
+        variants.append((f"{label}, cached", frame_loop(
+            lambda t, g=geometry: g.polygons(t, CENTER, CENTER))))
+
+    print(f"{'variant':<26}{'ms/frame':>10}")
+    for label, fn in variants:
+        best = min(timeit.repeat(fn, number=1, repeat=repeat))
+        print(f"{label:<26}{best / frames * 1000:>10.4f}")
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    run()
@@ -0,0 +1,148 @@
+import os
+import timeit
+import tempfile
+from intents import build_registry, SITES
+
+# (transcript, expected intent, expected slot); None means it falls through to the AI
+CORPUS = [
+    ("twilight", "wake", ""),
+    ("hey twilight", "wake", ""),
+    ("search youtube for lofi beats", "search_youtube", "lofi beats"),
+    ("search youtube cats", "search_youtube", "cats"),
+    ("youtube search for python tutorials", "search_youtube", "python tutorials"),
+    ("youtube search chess openings", "search_youtube", "chess openings"),
+    ("search on youtube for cooking", "search_youtube", "cooking"),
+    ("search on youtube", "search_youtube", ""),
+    ("search youtube", "search_youtube", ""),
+    ("current time", "time", ""),
+    ("what time is it", "time", ""),
+    ("tell me the time", "time", ""),
+    ("take screenshot", "screenshot", ""),
+    ("screenshot", "screenshot", ""),
+    ("take some screenshots", "screenshot", ""),
+    ("take burst screenshots", "screenshot_burst", ""),
+    ("play my music", "play_music", ""),
+    ("who are you", "who_are_you", ""),
+    ("how are you", "how_are_you", ""),
+    ("open", "open_music", ""),
+    ("open lofi girl", "open_other", "lofi girl"),
+    ("open on youtube arijit singh", "open_other", "arijit singh"),
+    ("thank you", "thank_you", ""),
+    ("bye", "exit", ""),
+    ("exit", "exit", ""),
+    ("goodbye", "exit", ""),
+    ("good bye twilight", "exit", ""),
+    ("okay bye twilight", "exit", ""),
+    ("what is the capital of france", None, ""),
+    ("tell me a joke", None, ""),
+    # Cases the old elif chain got wrong because of ordering and substring matching
+    ("open spotify at this time", "open_spotify", ""),
+    ("twilight open google", "open_google", ""),
+    ("what are the opening hours of the museum", None, ""),
+    ("sometimes i wonder", None, ""),
+    # Words inside a slot belong to the slot, not to another intent
+    ("search youtube for bye bye bye", "search_youtube", "bye bye bye"),
+    ("youtube search for exit strategy", "search_youtube", "exit strategy"),
+    ("open exit music", "open_other", "exit music"),
+] + [(f"open {key}", f"open_{key}", "") for key, _, _ in SITES]
+
+
+def legacy_route(command):
+    # Routing order of the original elif chain in voice_assistant, returning intent names
+    if "twilight" in command:
+        return "wake"
+    if "search youtube" in command or "youtube search" in command or "search on youtube" in command:
+        return "search_youtube"
+    for key in ("google", "anime", "gemini", "github"):
+        if f"open {key}" in command:
+            return f"open_{key}"
+    if "current time" in command or "what time is it" in command or "time" in command:
+        return "time"
+    for key in ("spotify", "netflix", "amazon", "notion", "tradingview", "chess", "linkedin", "whatsapp"):
+        if f"open {key}" in command:
+            return f"open_{key}"
+    if "take screenshot" in command or "screenshot" in command:
+        return "screenshot"
+    if "play my music" in command:
+        return "play_music"
+    if "who are you" in command:
+        return "who_are_you"
+    if "how are you" in command:
+        return "how_are_you"
+    if "open" in command and command != "open":
+        return "open_other"
+    if command == "open":
+        return "open_music"
+    if "thank you" in command:
+        return "thank_you"
+    if "bye" in command or "exit" in command:
+        return "exit"
+    return None
+
+
+def check_corpus(registry):
+    failures = 0
+    for command, expected, slot in CORPUS:
+        match = registry.match(command)
+        name = match.name if match else None
+        got_slot = match.slot if match else ""
+        if name != expected or got_slot != slot:
+            failures += 1
+            print(f"FAIL {command!r}: expected {expected}/{slot!r}, got {name}/{got_slot!r}")
+    print(f"corpus: {len(CORPUS) - failures}/{len(CORPUS)} passed")
+    return failures
+
+
+def check_aliases():
+    """A bad aliases.json must not stop the registry (and main_robot's import) from loading."""
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "aliases.json")
+        for content, loaded, phrase in (('{"lights out": "exit", "beam me": "no_such_intent"}', 1, "lights out"),
+                                        ('{"lights out": ', 0, None), ('["exit"]', 0, None)):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            registry = build_registry()
+            try:
+                count = registry.load_aliases(path)
+            except Exception as e:
+                failures += 1
+                print(f"FAIL aliases {content!r}: raised {type(e).__name__}: {e}")
+                continue
+            match = registry.match(phrase) if phrase else None
+            if count != loaded or (phrase and (match is None or match.name != "exit")):
+                failures += 1
+                print(f"FAIL aliases {content!r}: loaded {count}, expected {loaded}")
+    print(f"aliases: {'ok' if not failures else f'{failures} failed'}")
+    return failures
+
+
+def run(number=2000):
+    registry = build_registry()
+    failures = check_corpus(registry) + check_aliases()
+    commands = [command for command, _, _ in CORPUS]
+
+    legacy = min(timeit.repeat(lambda: [legacy_route(c) for c in commands], number=number // 10, repeat=3))
+    compiled = min(timeit.repeat(lambda: [registry.match(c) for c in commands], number=number // 10, repeat=3))
+    per_call = 1e6 / (len(commands) * (number // 10))
+    print(f"{'router':<34}{'us/command':>12}")
+    print(f"{'legacy elif chain':<34}{legacy * per_call:>12.2f}")
+    print(f"{'compiled registry':<34}{compiled * per_call:>12.2f}")
+
+    # Dispatch cost should stay flat as user aliases grow
+    for extra in (100, 1000, 5000):
+        grown = build_registry()
+        for i in range(extra):
+            grown.alias(f"custom shortcut number {i}", "play_music")
+        grown.compile()
+        phrases = [phrase for intent in grown.intents.values() for phrase in intent.phrases]
+        scan = min(timeit.repeat(lambda: [next((p for p in phrases if p in c), None) for c in commands],
+                                 number=number // 100, repeat=3))
+        elapsed = min(timeit.repeat(lambda: [grown.match(c) for c in commands], number=number // 10, repeat=3))
+        print(f"{f'substring scan + {extra} aliases':<34}{scan * per_call * 10:>12.2f}")
+        print(f"{f'compiled + {extra} aliases':<34}{elapsed * per_call:>12.2f}")
+    return failures
+
+
+if __name__ == "__main__":
+    raise SystemExit(1 if run() else 0)
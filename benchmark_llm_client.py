@@ -0,0 +1,84 @@
+import os
+import time
+import tempfile
+import requests
+from fake_llm_server import FakeLLMServer
+from llm_client import LLMClient, ResponseCache
+
+QUESTIONS = ["What is the capital of France?", "Tell me a joke", "what is the capital of france",
+             "How far is the moon?", "Tell me a joke!"]
+
+
+def timed(label, fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for question in QUESTIONS:
+            fn(question)
+    elapsed = (time.perf_counter() - start) / (rounds * len(QUESTIONS)) * 1000
+    print(f"{label:<28}{elapsed:>10.3f} ms/query")
+
+
+def check(label, value, ok):
+    print(f"{label:<28}{value:>10}{'' if ok else '  FAIL'}")
+    return 0 if ok else 1
+
+
+def check_cache_policy():
+    """TTL expiry and LRU eviction, without a server."""
+    failures = 0
+    cache = ResponseCache(max_entries=3, ttl_seconds=60)
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+    cache.get("a")
+    cache.put("d", "d")
+    kept = "".join(key for key in "abcd" if cache.get(key) is not None)
+    failures += check("kept after LRU eviction", kept, kept == "acd")
+
+    cache = ResponseCache(ttl_seconds=0.05)
+    cache.put("a", "a")
+    fresh = cache.get("a")
+    time.sleep(0.1)
+    stale = cache.get("a")
+    failures += check("expired after TTL", cache.expired, fresh == "a" and stale is None and cache.expired == 1)
+    return failures
+
+
+def run(rounds=40, delay=0.002):
+    server = FakeLLMServer(delay=delay).start()
+    failures = 0
+    try:
+        payload = LLMClient(url=server.url).payload
+
+        def unpooled(question):
+            # What get_ai_response did before: a fresh connection per request
+            requests.post(server.url, json=payload(question), timeout=10).json()
+
+        timed("requests.post per query", unpooled, rounds)
+        before = server.connections
+        client = LLMClient(url=server.url)
+        timed("pooled session", client.ask, rounds)
+        print(f"{'connections opened':<28}{server.connections - before:>10}")
+
+        path = os.path.join(tempfile.mkdtemp(), "llm_cache.json")
+        cached = LLMClient(url=server.url, cache=ResponseCache(path=path))
+        requests_before = server.requests
+        timed("pooled session + cache", cached.ask, rounds)
+        print(f"{'cache':<28}{cached.cache.stats()}")
+        # Case and trailing punctuation are normalised away, so five questions are three answers
+        failures += check("requests with cache", server.requests - requests_before,
+                          server.requests - requests_before == 3)
+        cached.cache.flush()
+
+        reloaded = LLMClient(url=server.url, cache=ResponseCache(path=path))
+        requests_before = server.requests
+        for question in QUESTIONS:
+            reloaded.ask(question)
+        failures += check("requests after restart", server.requests - requests_before,
+                          server.requests == requests_before)
+    finally:
+        server.stop()
+    return failures + check_cache_policy()
+
+
+if __name__ == "__main__":
+    raise SystemExit(1 if run() else 0)
@@ -0,0 +1,69 @@
+import time
+import queue
+import statistics
+from pipeline import VoicePipeline
+from tts import SpeechWorker, FileBackend
+
+
+class StubSource:
+    """Feeds transcripts in place of audio utterances."""
+
+    def __init__(self):
+        self.items = queue.Queue()
+
+    def push(self, text):
+        self.items.put(text)
+
+    def get(self, timeout=None):
+        return self.items.get(timeout=timeout)
+
+
+def run(commands=40, recognize_ms=20, dispatch_ms=30, words_per_reply=4):
+    source = StubSource()
+    speaker = SpeechWorker(FileBackend(seconds_per_word=0.01), phrases=[], cache_dir=None, max_pending=64)
+    done = queue.Queue()
+
+    def recognize(text):
+        time.sleep(recognize_ms / 1000)
+        return text
+
+    def dispatch(text):
+        time.sleep(dispatch_ms / 1000)
+        speaker.say(" ".join(["word"] * words_per_reply), wait=False)
+
+    # No speaker attached, so the echo gate stays out of the way: this measures stage overlap alone
+    pipeline = VoicePipeline(source, recognize, dispatch, None, on_complete=done.put, queue_size=64).start()
+    try:
+        start = time.monotonic()
+        for i in range(commands):
+            source.push(f"command {i}")
+        latencies = [done.get(timeout=10).latency() * 1000 for _ in range(commands)]
+        elapsed = time.monotonic() - start
+        sequential = commands * (recognize_ms + dispatch_ms + words_per_reply * 10) / 1000
+        print(f"{'commands/s':<24}{commands / elapsed:>10.1f}  (sequential loop: {commands / sequential:.1f})")
+        print(f"{'median latency ms':<24}{statistics.median(latencies):>10.1f}")
+    finally:
+        pipeline.stop()
+
+    pipeline = VoicePipeline(source, recognize, dispatch, speaker, on_complete=done.put, queue_size=64).start()
+    try:
+        while speaker.busy():
+            time.sleep(0.01)
+        # The assistant's own reply picked up by the microphone is dropped, wake word or not
+        speaker.say(" ".join(["word"] * 300), wait=False)
+        time.sleep(0.05)
+        source.push("i am twilight robot")
+        interaction = done.get(timeout=10)
+        print(f"{'own voice dispatched':<24}{str(interaction.times.get('dispatch_start') is not None):>10}"
+              f"  (echoes dropped: {pipeline.echoes})")
+
+        # Barge-in: a wake word arriving during a long reply cuts it off
+        source.push("twilight")
+        interaction = done.get(timeout=10)
+        print(f"{'barge-in latency ms':<24}{interaction.latency() * 1000:>10.1f}  (reply was 3000 ms)")
+    finally:
+        pipeline.stop()
+        speaker.stop()
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,102 @@
+import os
+import time
+import wave
+import tempfile
+import itertools
+from array import array
+from audio_capture import AudioCapture, WavSource, SyntheticSource, synthetic_speech
+from recognition import (GatedRecognizer, TemplateWakeWord, RecognizerChain, StubBackend,
+                         RecognitionError)
+
+# Synthetic stand-ins for recordings: "twilight" is two short bursts, other speech is one long tone
+WAKE = [(0.3, 0), (0.18, 4000, 300), (0.08, 0), (0.3, 3000, 900), (0.3, 0)]
+FIXTURES = {
+    "wake_open_google": WAKE[:-1] + [(0.2, 0), (0.5, 3000, 500), (0.3, 2500, 700), (0.7, 0)],
+    "wake_only": WAKE + [(0.5, 0)],
+    "chatter": [(0.3, 0), (1.2, 3500, 650), (0.7, 0)],
+    "cough": [(0.3, 0), (0.15, 6000, 2500), (0.8, 0)],
+}
+TRANSCRIPTS = {"wake_open_google": "twilight open google", "wake_only": "twilight",
+               "chatter": "so anyway i told him", "cough": ""}
+
+
+def write_wav(path, segments, seed):
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(16000)
+        w.writeframes(array("h", synthetic_speech(segments, seed=seed)).tobytes())
+
+
+def load_utterance(path, name):
+    capture = AudioCapture(WavSource(path)).start()
+    capture.finished.wait(10)
+    utterance = capture.get(timeout=1)
+    utterance.name = name
+    return utterance
+
+
+def noise_step():
+    """Room noise jumps from ~115 to ~870 RMS (a fan switching on), then someone speaks."""
+    samples = itertools.chain(synthetic_speech([(1.0, 0), (0.6, 3000, 500), (1.0, 0)], noise=200, seed=30),
+                              synthetic_speech([(10.0, 0), (0.8, 6000, 600), (1.5, 0)], noise=1500, seed=31))
+    capture = AudioCapture(SyntheticSource(samples)).start()
+    capture.finished.wait(10)
+    durations = []
+    while not capture.utterances.empty():
+        durations.append(capture.get().duration())
+    # The step itself may read as one utterance, but only until the floor catches up
+    failures = int(max(durations, default=0) > 5) + int(len(durations) < 2)
+    if durations and not 0.8 < durations[-1] < 2.5:
+        failures += 1
+    print(f"noise step: utterances {', '.join(f'{d:.2f}s' for d in durations)}, "
+          f"floor {capture.vad.noise_floor:.0f}{'' if not failures else '  FAIL'}")
+    return failures
+
+
+def run():
+    fixture_dir = tempfile.mkdtemp()
+    template_dir = os.path.join(fixture_dir, "wake_templates")
+    os.makedirs(template_dir)
+    for seed in (11, 12):
+        write_wav(os.path.join(template_dir, f"twilight_{seed}.wav"), WAKE, seed)
+    utterances = []
+    for seed, (name, segments) in enumerate(FIXTURES.items(), start=20):
+        path = os.path.join(fixture_dir, f"{name}.wav")
+        write_wav(path, segments, seed)
+        utterances.append(load_utterance(path, name))
+
+    # Primary backend is down; the chain falls back to the local stub
+    chain = RecognizerChain([StubBackend(fail=True, name="cloud"), StubBackend(TRANSCRIPTS, delay=0.05)],
+                            max_errors=2, cooldown_seconds=60)
+    recognize = GatedRecognizer(TemplateWakeWord.from_directory(template_dir), chain)
+
+    failures = 0
+    print(f"{'fixture':<20}{'woke':>6}{'score':>8}{'wake ms':>9}  transcript")
+    for utterance in utterances:
+        try:
+            text = recognize(utterance)
+        except RecognitionError as e:
+            text = f"<error {e}>"
+        woke = text is not None
+        expected = utterance.name.startswith("wake")
+        failures += woke != expected
+        print(f"{utterance.name:<20}{str(woke):>6}{recognize.wake_word.last_score:>8.3f}"
+              f"{recognize.wake_ms:>9.2f}  {text}")
+    print(recognize.report())
+
+    ungated = RecognizerChain([StubBackend(TRANSCRIPTS, delay=0.05)])
+    start = time.perf_counter()
+    for utterance in utterances:
+        ungated.transcribe(utterance)
+    ungated_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for utterance in utterances:
+        recognize(utterance)
+    gated_ms = (time.perf_counter() - start) * 1000
+    print(f"ungated {ungated_ms:.1f} ms, gated {gated_ms:.1f} ms for {len(utterances)} utterances")
+    return failures + noise_step()
+
+
+if __name__ == "__main__":
+    raise SystemExit(1 if run() else 0)
@@ -0,0 +1,190 @@
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QImage, QColor, QPaintDevice
+from PyQt5.QtCore import Qt, QEvent
+
+SIZES = [(300, 300), (500, 500), (800, 800)]
+PIXEL_RATIOS = [1.0, 2.0]
+STATES = ["idle", "listening", "processing"]
+GOLDEN_TIMES = [0, 90, 217]
+# Time advanced per frame at the idle tick rate, the cycle the frame cache is meant for
+IDLE_STEP = 3
+
+
+def at_pixel_ratio(widget_class, pixel_ratio):
+    """Subclass reporting ``pixel_ratio`` as its own, as on a HiDPI screen.
+
+    Rendering into a QImage with a device pixel ratio does not change the
+    widget's devicePixelRatioF(), which is what the frame cache sizes by.
+    """
+    class HiDPI(widget_class):
+        def metric(self, metric):
+            if metric == QPaintDevice.PdmDevicePixelRatio:
+                return int(pixel_ratio)
+            if metric == QPaintDevice.PdmDevicePixelRatioScaled:
+                return int(pixel_ratio * QPaintDevice.devicePixelRatioFScale())
+            return super().metric(metric)
+    return HiDPI
+
+
+def idle_paced(widget):
+    widget.time_step = lambda: IDLE_STEP
+    return widget
+
+
+def make_widgets():
+    import main_robot
+    import animated_circle
+    return [
+        ("PlasmaSphereWidget", lambda ratio: at_pixel_ratio(main_robot.PlasmaSphereWidget, ratio)(), STATES),
+        ("PlasmaSphereWidget+cache", lambda ratio: idle_paced(at_pixel_ratio(main_robot.PlasmaSphereWidget, ratio)(
+            frame_cache_mb=main_robot.FRAME_CACHE_MB)), STATES),
+        ("animated_circle.PlasmaSphere", lambda ratio: at_pixel_ratio(animated_circle.PlasmaSphere, ratio)(), ["idle"]),
+    ]
+
+
+def set_state(widget, state):
+    if hasattr(widget, "listening"):
+        widget.listening = state == "listening"
+        widget.processing = state == "processing"
+
+
+def render(widget, size, pixel_ratio, time_value, image=None):
+    width, height = size
+    if image is None:
+        image = QImage(int(width * pixel_ratio), int(height * pixel_ratio), QImage.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(pixel_ratio)
+    widget.time = time_value
+    image.fill(Qt.black)
+    widget.render(image)
+    return image
+
+
+def rss_mb():
+    """Resident set size now; falls back to the process peak (ru_maxrss, KB on Linux) without /proc."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_sweep(frames, sizes, pixel_ratios):
+    results = []
+    for name, factory, states in make_widgets():
+        for size in sizes:
+            for pixel_ratio in pixel_ratios:
+                for state in states:
+                    # Per row: what this widget and its caches hold on top of what was resident before it
+                    rss_before = rss_mb()
+                    widget = factory(pixel_ratio)
+                    widget.resize(*size)
+                    set_state(widget, state)
+                    image = render(widget, size, pixel_ratio, 0)
+                    cache = getattr(widget, "frame_cache", None)
+                    step = IDLE_STEP if cache else 1
+                    if cache:
+                        # Report the steady state, once every frame has been cached
+                        for i in range(frames):
+                            render(widget, size, pixel_ratio, i * step % 360, image)
+                    start = time.perf_counter()
+                    for i in range(frames):
+                        render(widget, size, pixel_ratio, i * step % 360, image)
+                    elapsed = time.perf_counter() - start
+                    results.append({
+                        "widget": name, "size": f"{size[0]}x{size[1]}", "dpr": pixel_ratio, "state": state,
+                        "ms_per_frame": round(elapsed / frames * 1000, 3),
+                        "fps": round(frames / elapsed, 1),
+                        "rss_delta_mb": round(rss_mb() - rss_before, 1),
+                    })
+                    if cache:
+                        stats = cache.stats()
+                        results[-1].update(cache_mb=stats["memory_mb"], hit_rate=stats["hit_rate"],
+                                           bypassed=stats["bypassed"])
+                    print(json.dumps(results[-1]))
+                    widget.deleteLater()
+                    # No event loop runs here, so free this row's widget, cache and image before the next row
+                    del widget, cache, image
+                    QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    return results
+
+
+def golden_frames():
+    for name, factory, states in make_widgets():
+        if name.endswith("+cache"):
+            continue
+        for state in states:
+            for time_value in GOLDEN_TIMES:
+                widget = factory(1.0)
+                widget.resize(500, 500)
+                set_state(widget, state)
+                yield f"{name}_{state}_{time_value}.png", render(widget, (500, 500), 1.0, time_value)
+                widget.deleteLater()
+
+
+def compare_images(expected, actual, tolerance):
+    """Fraction of pixels whose channels differ by more than ``tolerance``."""
+    if expected.size() != actual.size():
+        return 1.0
+    expected = expected.convertToFormat(QImage.Format_ARGB32)
+    actual = actual.convertToFormat(QImage.Format_ARGB32)
+    differing = 0
+    # Every other pixel is plenty to catch visual regressions
+    for y in range(0, expected.height(), 2):
+        for x in range(0, expected.width(), 2):
+            a = QColor(expected.pixel(x, y))
+            b = QColor(actual.pixel(x, y))
+            if max(abs(a.red() - b.red()), abs(a.green() - b.green()), abs(a.blue() - b.blue())) > tolerance:
+                differing += 1
+    return differing / (((expected.height() + 1) // 2) * ((expected.width() + 1) // 2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless per-frame cost of the sphere renderers.")
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--quick", action="store_true", help="one size and pixel ratio only")
+    parser.add_argument("--save-golden", metavar="DIR")
+    parser.add_argument("--check-golden", metavar="DIR")
+    parser.add_argument("--tolerance", type=int, default=8, help="max per-channel difference")
+    parser.add_argument("--max-diff", type=float, default=0.01, help="allowed fraction of differing pixels")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    if args.save_golden:
+        os.makedirs(args.save_golden, exist_ok=True)
+        for filename, image in golden_frames():
+            image.save(os.path.join(args.save_golden, filename))
+        print(f"golden frames saved to {args.save_golden}")
+        return 0
+
+    if args.check_golden:
+        failures = 0
+        for filename, image in golden_frames():
+            expected = QImage(os.path.join(args.check_golden, filename))
+            if expected.isNull():
+                print(f"MISSING {filename}")
+                failures += 1
+                continue
+            diff = compare_images(expected, image, args.tolerance)
+            status = "ok" if diff <= args.max_diff else "FAIL"
+            failures += status == "FAIL"
+            print(f"{status:<5}{filename:<48}{diff:.4f}")
+        return 1 if failures else 0
+
+    sizes = SIZES[1:2] if args.quick else SIZES
+    pixel_ratios = PIXEL_RATIOS[:1] if args.quick else PIXEL_RATIOS
+    run_sweep(args.frames, sizes, pixel_ratios)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import time
+import queue
+import shutil
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import main_robot
+from audio_capture import Utterance, synthetic_speech
+from array import array
+from benchmark_intents import CORPUS
+from fake_llm_server import FakeLLMServer
+from llm_client import LLMClient, ResponseCache
+from pipeline import VoicePipeline
+from recognition import RecognizerChain, StubBackend
+from screenshot import ScreenshotService, SyntheticSource
+from tts import SpeechWorker, FileBackend
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# Relative slowdown allowed against the saved baseline before the run fails
+TOLERANCE = 0.25
+
+
+def build_corpus(wav_dir=None):
+    """(name, transcript) pairs plus utterance audio, from recordings or synthesized."""
+    if wav_dir:
+        import wave
+        with open(os.path.join(wav_dir, "transcripts.json"), "r", encoding="utf-8") as f:
+            transcripts = json.load(f)
+        items = []
+        for name, text in transcripts.items():
+            with wave.open(os.path.join(wav_dir, f"{name}.wav"), "rb") as w:
+                utterance = Utterance(w.readframes(w.getnframes()), w.getframerate(), None, None)
+            utterance.name = name
+            items.append((utterance, text))
+        return items
+
+    texts = [text for text, intent, _ in CORPUS if intent != "exit"]
+    # Repeated questions exercise the LLM response cache
+    texts += ["what is the capital of france", "tell me a joke", "what is the capital of france?"]
+    items = []
+    for i, text in enumerate(texts):
+        pcm = array("h", synthetic_speech([(0.2, 3000), (0.1, 0)], seed=i)).tobytes()
+        utterance = Utterance(pcm, 16000, None, None)
+        utterance.name = f"utt{i:03d}"
+        items.append((utterance, text))
+    return items
+
+
+class Harness:
+    """Swaps main_robot's outside-world dependencies for local stand-ins."""
+
+    def __init__(self, llm_token_delay=0.0, tts_seconds_per_word=0.0):
+        self.server = FakeLLMServer(answer=lambda q: "This is a stand-in answer. It has two sentences.",
+                                    token_delay=llm_token_delay).start()
+        self.opened = []
+        main_robot.webbrowser.open = self.opened.append
+        self.screenshot_dir = tempfile.mkdtemp(prefix="twilight_replay_")
+        main_robot.screenshot_service = ScreenshotService(SyntheticSource(colors=("#202040", "#402020")),
+                                                         directory=self.screenshot_dir, burst_interval=0)
+        main_robot.llm_client = LLMClient(url=self.server.url, cache=ResponseCache())
+        main_robot.speech_worker = SpeechWorker(FileBackend(seconds_per_word=tts_seconds_per_word),
+                                                phrases=[], cache_dir=None, max_pending=256)
+
+    def close(self):
+        main_robot.speech_worker.stop()
+        main_robot.screenshot_service.close()
+        shutil.rmtree(self.screenshot_dir, ignore_errors=True)
+        self.server.stop()
+
+
+def summarize(label, latencies_ms, elapsed, allocations):
+    latencies_ms = sorted(latencies_ms)
+    pick = lambda p: latencies_ms[min(len(latencies_ms) - 1, int(len(latencies_ms) * p / 100))]
+    return {
+        "scenario": label,
+        "commands": len(latencies_ms),
+        "commands_per_s": round(len(latencies_ms) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies_ms), 3),
+        "p95_ms": round(pick(95), 3),
+        "p99_ms": round(pick(99), 3),
+        "max_ms": round(latencies_ms[-1], 3),
+        "retained_blocks": allocations[0],
+        "alloc_peak_kb": round(allocations[1] / 1024, 1),
+    }
+
+
+def measure(fn):
+    start = time.perf_counter()
+    latencies = fn()
+    return latencies, time.perf_counter() - start
+
+
+def measure_allocations(fn):
+    # A separate pass: tracing every allocation slows the run down too much to time it
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    fn()
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # Net blocks still held after the run, i.e. what it leaves behind
+    retained = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return retained, peak
+
+
+def run_dispatch(corpus, rounds):
+    def loop():
+        latencies = []
+        for _ in range(rounds):
+            for _, text in corpus:
+                start = time.perf_counter()
+                main_robot.dispatch_command(text)
+                latencies.append((time.perf_counter() - start) * 1000)
+        return latencies
+    return loop
+
+
+def run_pipeline(corpus, rounds):
+    def loop():
+        recognize = RecognizerChain([StubBackend({u.name: text for u, text in corpus})])
+        source = queue.Queue()
+        done = queue.Queue()
+        # No speaker: a reply still playing would make the echo gate drop the next utterance,
+        # which would then be timed as a (very fast) finished command
+        pipeline = VoicePipeline(source, recognize.transcribe, main_robot.dispatch_command,
+                                 None, on_complete=done.put, queue_size=8)
+        pipeline.start()
+        latencies = []
+        try:
+            for _ in range(rounds):
+                for utterance, text in corpus:
+                    source.put(utterance)
+                    interaction = done.get(timeout=30)
+                    if "dispatch_start" not in interaction.times:
+                        raise RuntimeError(f"{utterance.name} ({text!r}) was never dispatched")
+                    latencies.append(interaction.latency() * 1000)
+        finally:
+            pipeline.stop()
+        return latencies
+    return loop
+
+
+def compare(results, baseline):
+    failures = []
+    for result in results:
+        base = baseline.get(result["scenario"])
+        if not base:
+            continue
+        if result["commands_per_s"] < base["commands_per_s"] * (1 - TOLERANCE):
+            failures.append(f"{result['scenario']}: {result['commands_per_s']} commands/s "
+                            f"vs baseline {base['commands_per_s']}")
+        # Small absolute slack keeps sub-millisecond noise from failing the run
+        if result["p95_ms"] > base["p95_ms"] * (1 + TOLERANCE) + 0.5:
+            failures.append(f"{result['scenario']}: p95 {result['p95_ms']} ms vs baseline {base['p95_ms']} ms")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a command corpus through the assistant offline.")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--wav-dir", help="directory of recorded WAVs with a transcripts.json")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(args.wav_dir)
+    harness = Harness()
+    try:
+        results = []
+        for label, make in (("dispatch", run_dispatch), ("pipeline", run_pipeline)):
+            latencies, elapsed = measure(make(corpus, args.rounds))
+            allocations = measure_allocations(make(corpus, args.rounds))
+            results.append(summarize(label, latencies, elapsed, allocations))
+        results.append({"scenario": "llm_cache", **main_robot.llm_client.cache.stats()})
+        results.append({"scenario": "screenshots", **main_robot.screenshot_service.stats()})
+    finally:
+        harness.close()
+
+    for result in results:
+        print(json.dumps(result))
+    print(f"urls opened: {len(harness.opened)}")
+
+    timed = [r for r in results if "commands_per_s" in r]
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({r["scenario"]: r for r in timed}, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            failures = compare(timed, json.load(f))
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import sys
+import time
+import argparse
+import statistics
+from fake_llm_server import FakeLLMServer
+from llm_client import LLMClient, FALLBACK_RESPONSE
+
+
+def percentiles(latencies_ms):
+    latencies_ms = sorted(latencies_ms)
+    pick = lambda p: latencies_ms[min(len(latencies_ms) - 1, int(len(latencies_ms) * p / 100))]
+    return f"p50 {statistics.median(latencies_ms):8.1f}  p95 {pick(95):8.1f}  p99 {pick(99):8.1f}  ms"
+
+
+def timed_ask(client, question):
+    start = time.perf_counter()
+    answer = client.ask(question)
+    return (time.perf_counter() - start) * 1000, answer != FALLBACK_RESPONSE
+
+
+def check(label, ok):
+    if not ok:
+        print(f"  FAIL {label}")
+    return 0 if ok else 1
+
+
+def p95(latencies_ms):
+    latencies_ms = sorted(latencies_ms)
+    return latencies_ms[min(len(latencies_ms) - 1, int(len(latencies_ms) * 0.95))]
+
+
+def warm_up(client, count=30):
+    # Gives the adaptive timeout and hedging some latency history
+    for i in range(count):
+        client.ask(f"warm up {i}")
+
+
+def outage(timeout, questions, probe_interval):
+    print(f"endpoint black-holed, {questions} questions, timeout {timeout}s")
+    server = FakeLLMServer(delay=0.005).start()
+    failures = 0
+    try:
+        for label, client in (
+            ("fixed timeout", LLMClient(url=server.url, timeout=timeout, adaptive_timeout=False,
+                                        failure_threshold=0)),
+            ("adaptive + breaker", LLMClient(url=server.url, timeout=timeout, probe_interval=probe_interval)),
+        ):
+            server.outage = None
+            warm_up(client)
+            server.outage = "hang"
+            # The fixed-timeout client waits the full timeout every time; two questions show it
+            count = questions if client.endpoints[0].breaker.failure_threshold else min(questions, 2)
+            latencies = [timed_ask(client, f"outage question {i}")[0] for i in range(count)]
+            server.outage = None
+            start = time.perf_counter()
+            recovered = None
+            while time.perf_counter() - start < probe_interval * 4 + timeout:
+                if timed_ask(client, "are you back")[1]:
+                    recovered = (time.perf_counter() - start) * 1000
+                    break
+                time.sleep(0.05)
+            per_question = " ".join(f"{ms:.0f}" for ms in latencies)
+            print(f"  {label:<20} per question ms: {per_question}")
+            print(f"  {'':<20} total {sum(latencies) / 1000:.1f}s, recovered after "
+                  f"{recovered if recovered is None else round(recovered)} ms")
+            breaker = client.endpoints[0].breaker
+            if breaker.failure_threshold:
+                failures += check(f"breaker opened once after {breaker.failure_threshold} failures",
+                                  breaker.opened == 1)
+                failures += check("questions fail fast once the breaker is open",
+                                  all(ms < 50 for ms in latencies[breaker.failure_threshold:]))
+                failures += check("recovered within about one probe interval",
+                                  recovered is not None and recovered < probe_interval * 1500)
+            client.close()
+    finally:
+        server.stop()
+    return failures
+
+
+def tail_latency(requests_count, slow_rate, slow_delay):
+    print(f"{slow_rate:.0%} of requests stall {slow_delay}s")
+    server = FakeLLMServer(delay=0.005, slow_rate=slow_rate, slow_delay=slow_delay).start()
+    tails = {}
+    try:
+        for label, hedge in (("single request", False), ("hedged at p95", True)):
+            client = LLMClient(url=server.url, hedge=hedge)
+            server.slow_rate = 0.0
+            warm_up(client)
+            server.slow_rate = slow_rate
+            latencies = [timed_ask(client, f"tail {i}")[0] for i in range(requests_count)]
+            print(f"  {label:<20} {percentiles(latencies)}  hedges {client.hedges}, won {client.hedge_wins}")
+            tails[hedge] = p95(latencies)
+            client.close()
+    finally:
+        server.stop()
+    return check("hedged p95 below single-request p95", tails[True] < tails[False])
+
+
+def failover(questions):
+    print(f"primary returns 503s, secondary endpoint healthy, {questions} questions")
+    primary = FakeLLMServer(outage="error").start()
+    secondary = FakeLLMServer(delay=0.005).start()
+    failures = 0
+    try:
+        for label, backup in (("primary only", None), ("with secondary", {"url": secondary.url})):
+            client = LLMClient(url=primary.url, secondary=backup, probe_interval=60)
+            results = [timed_ask(client, f"failover {i}") for i in range(questions)]
+            answered = sum(1 for _, ok in results if ok)
+            print(f"  {label:<20} answered {answered}/{questions}  {percentiles([ms for ms, _ in results])}")
+            if backup:
+                failures += check("secondary answered every question", answered == questions)
+            client.close()
+    finally:
+        primary.stop()
+        secondary.stop()
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LLM client behaviour under injected endpoint faults.")
+    parser.add_argument("--timeout", type=float, default=10)
+    parser.add_argument("--questions", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--probe-interval", type=float, default=1.0)
+    args = parser.parse_args(argv)
+    failures = outage(args.timeout, args.questions, args.probe_interval)
+    failures += tail_latency(args.requests, 0.05, 0.5)
+    failures += failover(args.questions)
+    print("all checks passed" if not failures else f"{failures} checks failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+
+def child():
+    """One cold launch: real imports and window, synthetic microphone, local LLM stand-in."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ["TWILIGHT_TTS_BACKEND"] = "file"
+    import threading
+    import main_robot
+    from PyQt5.QtCore import QTimer
+    from audio_capture import SyntheticSource, synthetic_speech
+    from fake_llm_server import FakeLLMServer
+    from llm_client import LLMClient
+
+    server = FakeLLMServer().start()
+    main_robot.llm_client = LLMClient(url=server.url)
+    with main_robot.startup.phase("window"):
+        app = main_robot.QApplication(sys.argv)
+        gui = main_robot.TwilightGUI()
+        gui.show()
+
+    # Room noise at real-time pace, so calibration costs what it would with a microphone
+    source_factory = lambda: SyntheticSource(synthetic_speech([(120, 0)]), realtime=True)
+    voice_thread = threading.Thread(target=main_robot.voice_assistant, args=(gui, source_factory), daemon=True)
+    voice_thread.start()
+
+    def poll():
+        if not main_robot.startup.ready_event.is_set():
+            return
+        timer.stop()
+        print(json.dumps(main_robot.startup.report()), flush=True)
+        gui.close()
+        app.quit()
+
+    timer = QTimer()
+    timer.timeout.connect(poll)
+    timer.start(5)
+    app.exec_()
+    voice_thread.join(timeout=5)
+    server.stop()
+    return 0
+
+
+def launch():
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--child"],
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    line = process.stdout.readline()
+    spawn_to_ready = (time.perf_counter() - start) * 1000
+    process.wait(timeout=30)
+    report = json.loads(line)
+    report["spawn_to_ready_ms"] = round(spawn_to_ready, 1)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start time-to-ready of the assistant, headless.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        return child()
+
+    reports = []
+    for _ in range(args.runs):
+        reports.append(launch())
+        print(json.dumps(reports[-1]))
+
+    print(f"{'phase':<16}{'median ms':>12}{'max ms':>10}")
+    names = [p["phase"] for p in reports[0]["phases"]]
+    for name in names:
+        durations = [p["duration_ms"] for r in reports for p in r["phases"] if p["phase"] == name]
+        print(f"{name:<16}{statistics.median(durations):>12.1f}{max(durations):>10.1f}")
+    for key in ("time_to_ready_ms", "spawn_to_ready_ms"):
+        values = [r[key] for r in reports]
+        print(f"{key:<16}{statistics.median(values):>12.1f}{max(values):>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
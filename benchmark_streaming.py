@@ -0,0 +1,39 @@
+import time
+from fake_llm_server import FakeLLMServer
+from llm_client import LLMClient
+from tts import SpeechWorker, FileBackend
+
+ANSWER = ("Paris is the capital of France. It sits on the Seine river in the north of the country. "
+          "About two million people live in the city itself. It is known for art, food and fashion.")
+
+
+def time_to_first_audio(play):
+    start = time.monotonic()
+    handles = play()
+    done = time.monotonic()
+    first = min(h.started for h in handles if h.started is not None)
+    return (first - start) * 1000, (done - start) * 1000
+
+
+def run(token_delay=0.03):
+    server = FakeLLMServer(answer=lambda question: ANSWER, token_delay=token_delay).start()
+    worker = SpeechWorker(FileBackend(seconds_per_word=0.01), phrases=[], cache_dir=None)
+    try:
+        client = LLMClient(url=server.url)
+        blocking_answer = lambda: [worker.say(" ".join(client.ask_sentences("capital of france")), wait=True)]
+        streaming_answer = lambda: worker.say_stream(client.ask_sentences("capital of france"))
+
+        blocking, blocking_total = time_to_first_audio(blocking_answer)
+        streaming, streaming_total = time_to_first_audio(streaming_answer)
+        print(f"{'mode':<12}{'first audio ms':>16}{'done ms':>10}")
+        print(f"{'blocking':<12}{blocking:>16.1f}{blocking_total:>10.1f}")
+        print(f"{'streaming':<12}{streaming:>16.1f}{streaming_total:>10.1f}")
+        if streaming >= blocking / 2:
+            raise SystemExit("streaming did not cut time-to-first-audio")
+    finally:
+        worker.stop()
+        server.stop()
+
+
+if __name__ == "__main__":
+    run()
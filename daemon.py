@@ -0,0 +1,305 @@
+import sys
+import json
+import time
+import queue
+import socket
+import argparse
+import threading
+from collections import deque, Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import main_robot
+from instrumentation import Tracer
+from pipeline import STOP
+
+DEFAULT_PORT = 8765
+
+# Field each job kind needs in its JSON body
+REQUIRED = {"command": "text", "ask": "question", "speak": "text"}
+
+
+class Job:
+    def __init__(self, client, kind, params):
+        self.client = client
+        self.kind = kind
+        self.params = params
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+        self.queued = time.monotonic()
+        self.started = None
+
+
+class ClientQueues:
+    """Bounded FIFO per client, served round-robin so one busy client cannot starve the others."""
+
+    def __init__(self, max_pending=8):
+        self.max_pending = max_pending
+        self.queues = {}
+        # Clients with queued jobs, in the order they get their next turn
+        self.ready = deque()
+        self.cond = threading.Condition()
+        self.closed = False
+
+    def put(self, job):
+        with self.cond:
+            jobs = self.queues.setdefault(job.client, deque())
+            if len(jobs) >= self.max_pending:
+                raise queue.Full
+            jobs.append(job)
+            if len(jobs) == 1:
+                self.ready.append(job.client)
+            self.cond.notify()
+
+    def get(self):
+        with self.cond:
+            self.cond.wait_for(lambda: self.ready or self.closed)
+            if not self.ready:
+                return None
+            client = self.ready.popleft()
+            jobs = self.queues[client]
+            job = jobs.popleft()
+            if jobs:
+                self.ready.append(client)
+            else:
+                del self.queues[client]
+            return job
+
+    def depth(self):
+        with self.cond:
+            return {client: len(jobs) for client, jobs in self.queues.items()}
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+class CommandEngine:
+    """Runs client jobs on a bounded worker pool against main_robot's shared registry, LLM client and speech."""
+
+    def __init__(self, workers=4, max_pending=8):
+        self.workers = workers
+        self.queues = ClientQueues(max_pending)
+        self.tracer = Tracer(enabled=True, window=2000)
+        self.handlers = {"command": self.run_command, "ask": self.run_ask, "speak": self.run_speak}
+        self.lock = threading.Lock()
+        self.busy = 0
+        self.completed = Counter()
+        self.rejected = Counter()
+        self.threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"daemon-worker-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def stop(self):
+        self.queues.close()
+        for thread in self.threads:
+            thread.join(timeout=2)
+
+    def submit(self, client, kind, params):
+        """Queue a job for ``client``; raises queue.Full when that client already has too many pending."""
+        job = Job(client, kind, params)
+        try:
+            self.queues.put(job)
+        except queue.Full:
+            with self.lock:
+                self.rejected[client] += 1
+            raise
+        return job
+
+    def _work(self):
+        while True:
+            job = self.queues.get()
+            if job is None:
+                return
+            with self.lock:
+                self.busy += 1
+            job.started = time.monotonic()
+            trace = self.tracer.begin()
+            trace.add_span("queued", job.queued, job.started)
+            try:
+                with trace.span(job.kind):
+                    job.result = self.handlers[job.kind](job.params)
+            except Exception as e:
+                job.error = e
+            with self.lock:
+                self.busy -= 1
+                self.completed[job.kind] += 1
+            self.tracer.finish(trace)
+            job.done.set()
+
+    def run_command(self, params):
+        text = params["text"]
+        match = main_robot.command_registry.match(text)
+        context = main_robot.reply_context
+        context.replies = []
+        context.speak = bool(params.get("speak", True))
+        try:
+            result = main_robot.dispatch_command(text)
+        finally:
+            replies = context.replies
+            context.replies = None
+        return {
+            "intent": match.name if match else None,
+            "slot": match.slot if match else "",
+            "replies": replies,
+            "stop": result is STOP,
+        }
+
+    def run_ask(self, params):
+        return {"answer": main_robot.llm_client.ask(params["question"])}
+
+    def run_speak(self, params):
+        handle = main_robot.get_speech_worker().say(params["text"], wait=bool(params.get("wait")))
+        return {"spoken": handle.done(), "cancelled": handle.cancelled}
+
+    def speech_busy(self):
+        return main_robot.speech_worker is not None and main_robot.speech_worker.busy()
+
+    def interrupt(self):
+        if main_robot.speech_worker is not None:
+            main_robot.speech_worker.interrupt()
+
+    def stats(self):
+        with self.lock:
+            stats = {
+                "workers": self.workers,
+                "busy": self.busy,
+                "completed": dict(self.completed),
+                "rejected": dict(self.rejected),
+            }
+        stats["queued"] = self.queues.depth()
+        stats["latency_ms"] = self.tracer.report()["latency_ms"]
+        stats["llm"] = main_robot.llm_client.stats()
+        if main_robot.llm_client.cache:
+            stats["llm_cache"] = main_robot.llm_client.cache.stats()
+        return stats
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def client_id(self):
+        return self.headers.get("X-Twilight-Client") or f"{self.client_address[0]}:{self.client_address[1]}"
+
+    def send_json(self, status, data, headers=()):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        engine = self.server.engine
+        if self.path == "/stats":
+            self.send_json(200, engine.stats())
+        elif self.path == "/speech":
+            self.send_json(200, {"busy": engine.speech_busy()})
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            params = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_json(400, {"error": "invalid JSON"})
+            return
+        engine = self.server.engine
+        if self.path == "/interrupt":
+            engine.interrupt()
+            self.send_json(200, {"interrupted": True})
+            return
+        kind = self.path.lstrip("/")
+        if kind not in REQUIRED:
+            self.send_json(404, {"error": "not found"})
+            return
+        if not isinstance(params, dict) or not isinstance(params.get(REQUIRED[kind]), str):
+            self.send_json(400, {"error": f"'{REQUIRED[kind]}' is required"})
+            return
+        try:
+            job = engine.submit(self.client_id(), kind, params)
+        except queue.Full:
+            # Backpressure: this client already has a full queue
+            self.send_json(429, {"error": "too many pending requests"}, [("Retry-After", "1")])
+            return
+        if not job.done.wait(self.server.request_timeout):
+            self.send_json(504, {"error": "timed out"})
+            return
+        if job.error is not None:
+            self.send_json(500, {"error": f"{type(job.error).__name__}: {job.error}"})
+            return
+        self.send_json(200, job.result)
+
+
+class TwilightDaemon(ThreadingHTTPServer):
+    """Local HTTP front for the command engine; one process serves every front end on the host."""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, engine=None, request_timeout=60):
+        super().__init__((host, port), DaemonHandler)
+        self.engine = engine or CommandEngine()
+        self.request_timeout = request_timeout
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.engine.start()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self.engine.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Twilight: command engine over a local HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=8, help="queued requests allowed per client")
+    args = parser.parse_args(argv)
+
+    # Shared by every client, so warm them once up front
+    main_robot.get_speech_worker()
+    main_robot.get_screenshot_service()
+    threading.Thread(target=main_robot.llm_client.warm, daemon=True).start()
+    daemon = TwilightDaemon(args.host, args.port, CommandEngine(args.workers, args.max_pending)).start()
+    print(f"Twilight daemon listening on {daemon.url}")
+    try:
+        daemon.thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+        main_robot.screenshot_service.close()
+        if main_robot.llm_client.cache:
+            main_robot.llm_client.cache.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
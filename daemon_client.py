@@ -0,0 +1,79 @@
+import threading
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+
+
+class DaemonError(Exception):
+    """The daemon could not handle a request."""
+
+
+class DaemonBusyError(DaemonError):
+    """This client's queue on the daemon is full; retry after ``retry_after`` seconds."""
+
+    def __init__(self, message, retry_after=1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DaemonClient:
+    """Talks to daemon.py over its local HTTP API on one keep-alive session."""
+
+    def __init__(self, url=DEFAULT_URL, client_id="client", timeout=60):
+        self.url = url.rstrip("/")
+        self.client_id = client_id
+        self.timeout = timeout
+        self.requests = None
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    self.requests = requests
+                    session = requests.Session()
+                    session.headers.update({"X-Twilight-Client": self.client_id})
+                    self._session = session
+        return self._session
+
+    def _call(self, method, path, body=None):
+        session = self.session
+        try:
+            response = session.request(method, self.url + path, json=body, timeout=self.timeout)
+        except self.requests.RequestException as e:
+            raise DaemonError(f"daemon unreachable: {e}") from e
+        if response.status_code == 429:
+            raise DaemonBusyError("daemon queue full", float(response.headers.get("Retry-After", 1)))
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        if response.status_code != 200:
+            raise DaemonError(data.get("error") or f"status {response.status_code}")
+        return data
+
+    def command(self, text, speak=True):
+        """Run a command; returns intent, slot, replies and whether it asked to stop."""
+        return self._call("POST", "/command", {"text": text, "speak": speak})
+
+    def ask(self, question):
+        return self._call("POST", "/ask", {"question": question})["answer"]
+
+    def speak(self, text, wait=False):
+        return self._call("POST", "/speak", {"text": text, "wait": wait})
+
+    # busy() and interrupt() let the client stand in as the pipeline's speaker for barge-in
+    def busy(self):
+        return self._call("GET", "/speech")["busy"]
+
+    def interrupt(self):
+        return self._call("POST", "/interrupt")
+
+    def stats(self):
+        return self._call("GET", "/stats")
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
@@ -0,0 +1,172 @@
+import sys
+import json
+import random
+import socket
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def echo_answer(question):
+    return f"You asked: {question}"
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; avoid Nagle stalls on keep-alive
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        # Connection warm-up probe
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        with self.server.lock:
+            self.server.requests += 1
+        fault = self.server.next_fault()
+        if fault == "error":
+            self.send_error(503, "Injected failure")
+            return
+        if fault == "drop":
+            # Hang up without answering
+            self.close_connection = True
+            self.request.shutdown(socket.SHUT_RDWR)
+            return
+        if fault == "hang":
+            self.server.stopping.wait(self.server.hang_seconds)
+            self.close_connection = True
+            return
+        if fault == "slow":
+            time.sleep(self.server.slow_delay)
+        question = payload.get("messages", [{}])[-1].get("content", "")
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        answer = self.server.answer(question)
+        if payload.get("stream"):
+            self.stream_answer(payload, answer)
+            return
+        body = json.dumps({
+            "model": payload.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}]
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+    def stream_answer(self, payload, answer):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in answer.split(" "):
+            if self.server.token_delay:
+                time.sleep(self.server.token_delay)
+            chunk = {"model": payload.get("model"),
+                     "choices": [{"index": 0, "delta": {"content": token + " "}, "finish_reason": None}]}
+            # Raw UTF-8 rather than \u escapes, as hosted providers send it
+            self.write_chunk(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n")
+        self.write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    """Local stand-in for an OpenAI-compatible chat completions endpoint.
+
+    Faults can be injected per request: ``outage`` ("error" for 503s, "hang"
+    for a black hole) hits every request, while ``error_rate``, ``drop_rate``
+    and ``slow_rate`` (a ``slow_delay`` pause, i.e. tail latency) hit a
+    seeded random share of them. All of them can be changed while running.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, answer=echo_answer, delay=0.0, token_delay=0.0,
+                 handler=FakeLLMHandler, outage=None, error_rate=0.0, drop_rate=0.0, slow_rate=0.0,
+                 slow_delay=1.0, hang_seconds=60.0, seed=1):
+        super().__init__((host, port), handler)
+        self.answer = answer
+        self.delay = delay
+        # Per-token pause for streamed answers, to simulate slow generation
+        self.token_delay = token_delay
+        self.outage = outage
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.slow_rate = slow_rate
+        self.slow_delay = slow_delay
+        self.hang_seconds = hang_seconds
+        self.random = random.Random(seed)
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.faults = {}
+        self.thread = None
+
+    def next_fault(self):
+        with self.lock:
+            fault = self.outage
+            if fault is None:
+                roll = self.random.random()
+                for name, rate in (("error", self.error_rate), ("drop", self.drop_rate), ("slow", self.slow_rate)):
+                    if roll < rate:
+                        fault = name
+                        break
+                    roll -= rate
+            if fault:
+                self.faults[fault] = self.faults.get(fault, 0) + 1
+            return fault
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up on injected faults are expected
+        if not isinstance(sys.exc_info()[1], (ConnectionError, TimeoutError)):
+            super().handle_error(request, client_address)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/openai/v1/chat/completions"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Fake chat completions endpoint with fault injection.")
+    parser.add_argument("port", type=int, nargs="?", default=8088)
+    parser.add_argument("--outage", choices=["error", "hang"])
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-delay", type=float, default=1.0)
+    args = parser.parse_args()
+    server = FakeLLMServer(port=args.port, outage=args.outage, error_rate=args.error_rate,
+                           drop_rate=args.drop_rate, slow_rate=args.slow_rate, slow_delay=args.slow_delay)
+    print(f"Serving fake chat completions on {server.url}")
+    server.serve_forever()
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+
+
+class FrameCache:
+    """Memory-bounded LRU of pre-rendered animation frames."""
+
+    def __init__(self, max_mb=192):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.frames = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0
+        self.surface = None
+
+    def fits(self, frames, width, height):
+        """Whether a whole cycle of ``frames`` frames of this pixel size fits in the budget.
+
+        A cycle that does not fit would only evict itself frame by frame, so callers
+        should paint directly instead.
+        """
+        if frames * width * height * 4 <= self.max_bytes:
+            return True
+        self.bypassed += 1
+        return False
+
+    def check_surface(self, width, height, pixel_ratio):
+        # Frames are only valid for the size and DPI they were rendered at
+        surface = (width, height, pixel_ratio)
+        if surface != self.surface:
+            self.invalidate()
+            self.surface = surface
+
+    def get(self, key):
+        pixmap = self.frames.get(key)
+        if pixmap is None:
+            self.misses += 1
+            return None
+        self.frames.move_to_end(key)
+        self.hits += 1
+        return pixmap
+
+    def put(self, key, pixmap):
+        size = frame_bytes(pixmap)
+        if size > self.max_bytes:
+            return
+        old = self.frames.pop(key, None)
+        if old is not None:
+            self.bytes_used -= frame_bytes(old)
+        while self.frames and self.bytes_used + size > self.max_bytes:
+            _, evicted = self.frames.popitem(last=False)
+            self.bytes_used -= frame_bytes(evicted)
+            self.evictions += 1
+        self.frames[key] = pixmap
+        self.bytes_used += size
+
+    def invalidate(self):
+        self.frames.clear()
+        self.bytes_used = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "frames": len(self.frames),
+            "memory_mb": round(self.bytes_used / (1024 * 1024), 2),
+            "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hit_rate(), 4),
+        }
+
+
+def frame_bytes(pixmap):
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
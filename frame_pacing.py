@@ -0,0 +1,123 @@
+import time
+
+from PyQt5.QtCore import QObject, QTimer, QEvent
+
+# Render quality levels, highest first. Widgets scale their own detail from these.
+QUALITY_LEVELS = [
+    {"name": "high", "glow_fraction": 1.0, "segment_scale": 1, "antialias": True},
+    {"name": "medium", "glow_fraction": 0.5, "segment_scale": 2, "antialias": True},
+    {"name": "low", "glow_fraction": 0.25, "segment_scale": 4, "antialias": False},
+]
+
+
+class FrameScheduler(QObject):
+    """Drives an animation timer, pausing it while hidden and adapting quality to paint time."""
+
+    def __init__(self, widget, tick, interval_ms, idle_interval_ms=250, budget_ms=None,
+                 downgrade_after=5, upgrade_after=60):
+        super().__init__()
+        self.widget = widget
+        self.tick = tick
+        self.interval_ms = interval_ms
+        self.idle_interval_ms = idle_interval_ms
+        # Paint time allowed per frame before quality is reduced
+        self.budget_ms = budget_ms if budget_ms is not None else interval_ms * 0.5
+        self.downgrade_after = downgrade_after
+        self.upgrade_after = upgrade_after
+        self.quality_index = 0
+        self.idle = False
+        self.paint_ms = 0.0
+        self.over_budget = 0
+        self.under_budget = 0
+        self._paint_started = None
+        self._watched_window = None
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        widget.installEventFilter(self)
+
+    @property
+    def quality(self):
+        return QUALITY_LEVELS[self.quality_index]
+
+    def start(self):
+        self.refresh()
+
+    def stop(self):
+        self.timer.stop()
+
+    def set_idle(self, idle):
+        if idle != self.idle:
+            self.idle = idle
+            self.refresh()
+
+    def current_interval(self):
+        return self.idle_interval_ms if self.idle else self.interval_ms
+
+    def is_visible(self):
+        window = self.widget.window()
+        if not window.isVisible() or window.isMinimized():
+            return False
+        handle = window.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def refresh(self):
+        if not self.is_visible():
+            self.timer.stop()
+            return
+        interval = self.current_interval()
+        if not self.timer.isActive() or self.timer.interval() != interval:
+            self.timer.start(interval)
+
+    def paint_started(self):
+        self._paint_started = time.perf_counter()
+
+    def paint_finished(self):
+        if self._paint_started is None:
+            return
+        elapsed_ms = (time.perf_counter() - self._paint_started) * 1000
+        self._paint_started = None
+        self.record_paint(elapsed_ms)
+
+    def record_paint(self, elapsed_ms):
+        # Smooth out single slow frames before reacting
+        self.paint_ms = elapsed_ms if not self.paint_ms else 0.8 * self.paint_ms + 0.2 * elapsed_ms
+        if self.paint_ms > self.budget_ms:
+            self.over_budget += 1
+            self.under_budget = 0
+            if self.over_budget >= self.downgrade_after and self.quality_index < len(QUALITY_LEVELS) - 1:
+                self.quality_index += 1
+                self.over_budget = 0
+                self.paint_ms = 0.0
+        elif self.paint_ms < self.budget_ms * 0.4:
+            self.under_budget += 1
+            self.over_budget = 0
+            if self.under_budget >= self.upgrade_after and self.quality_index > 0:
+                self.quality_index -= 1
+                self.under_budget = 0
+                self.paint_ms = 0.0
+        else:
+            self.over_budget = 0
+            self.under_budget = 0
+
+    def eventFilter(self, obj, event):
+        event_type = event.type()
+        if obj is self.widget and event_type in (QEvent.Show, QEvent.ParentChange):
+            self._watch_window()
+        if event_type in (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange, QEvent.Expose):
+            # Let Qt finish applying the state change before checking visibility
+            QTimer.singleShot(0, self.refresh)
+        return False
+
+    def _watch_window(self):
+        window = self.widget.window()
+        if window is self._watched_window:
+            return
+        if self._watched_window is not None:
+            self._watched_window.removeEventFilter(self)
+        self._watched_window = window
+        if window is not self.widget:
+            window.installEventFilter(self)
+        handle = window.windowHandle()
+        if handle is not None:
+            handle.installEventFilter(self)
@@ -0,0 +1,184 @@
+import os
+import json
+import time
+import threading
+import itertools
+from collections import deque, Counter
+
+
+class Span:
+    def __init__(self, trace, stage):
+        self.trace = trace
+        self.stage = stage
+        self.start = None
+        self.end = None
+        self.error = None
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.monotonic()
+        if exc is not None:
+            self.error = type(exc).__name__
+            self.trace.tracer.count_error(self.stage, exc)
+        self.trace.spans.append(self)
+        return False
+
+    def duration_ms(self):
+        return (self.end - self.start) * 1000
+
+
+class Trace:
+    """Spans of a single interaction, timed with the monotonic clock."""
+
+    def __init__(self, tracer, trace_id):
+        self.tracer = tracer
+        self.id = trace_id
+        self.wall_start = time.time()
+        self.start = time.monotonic()
+        self.spans = []
+        self.text = None
+
+    def span(self, stage):
+        return Span(self, stage)
+
+    def add_span(self, stage, start, end):
+        span = Span(self, stage)
+        span.start = start
+        span.end = end
+        self.spans.append(span)
+
+    def error(self, stage, exc):
+        span = Span(self, stage)
+        span.start = span.end = time.monotonic()
+        span.error = type(exc).__name__
+        self.spans.append(span)
+        self.tracer.count_error(stage, exc)
+
+    def summary(self):
+        origin = min([self.start] + [s.start for s in self.spans])
+        return {
+            "id": self.id,
+            "time": self.wall_start,
+            "text": self.text,
+            "spans": [{"stage": s.stage, "start_ms": round((s.start - origin) * 1000, 2),
+                       "duration_ms": round(s.duration_ms(), 2), "error": s.error}
+                      for s in sorted(self.spans, key=lambda s: s.start)],
+        }
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _NullTrace:
+    id = None
+    text = None
+    spans = ()
+    _span = _NullSpan()
+
+    def span(self, stage):
+        return self._span
+
+    def add_span(self, stage, start, end):
+        pass
+
+    def error(self, stage, exc):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class Tracer:
+    """Collects per-stage spans, rolling latency percentiles and error counts; optional JSONL export."""
+
+    def __init__(self, enabled=True, path=None, window=500):
+        self.enabled = enabled
+        self.path = path
+        self.window = window
+        self.durations = {}
+        self.errors = Counter()
+        self.listeners = []
+        self.last = None
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.ids = itertools.count(1)
+
+    def begin(self):
+        if not self.enabled:
+            return NULL_TRACE
+        return Trace(self, next(self.ids))
+
+    def finish(self, trace):
+        if trace is NULL_TRACE:
+            return
+        summary = trace.summary()
+        with self.lock:
+            for span in trace.spans:
+                if span.error is None:
+                    samples = self.durations.get(span.stage)
+                    if samples is None:
+                        samples = self.durations[span.stage] = deque(maxlen=self.window)
+                    samples.append(span.duration_ms())
+            self.last = summary
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(summary) + "\n")
+        for listener in self.listeners:
+            listener(summary)
+
+    def count_error(self, stage, exc):
+        with self.lock:
+            self.errors[(stage, type(exc).__name__)] += 1
+
+    # The trace a stage thread is currently working on, so nested calls can add spans
+    def activate(self, trace):
+        self.local.trace = trace
+
+    def current(self):
+        return getattr(self.local, "trace", NULL_TRACE)
+
+    def span(self, stage):
+        return self.current().span(stage)
+
+    def record_error(self, stage, exc):
+        trace = self.current()
+        if trace is NULL_TRACE:
+            if self.enabled:
+                self.count_error(stage, exc)
+        else:
+            trace.error(stage, exc)
+
+    def percentiles(self, stage, points=(50, 95, 99)):
+        with self.lock:
+            samples = sorted(self.durations.get(stage, ()))
+        if not samples:
+            return {}
+        return {f"p{p}": round(samples[min(len(samples) - 1, int(len(samples) * p / 100))], 2)
+                for p in points}
+
+    def report(self):
+        return {
+            "latency_ms": {stage: dict(self.percentiles(stage), count=len(self.durations[stage]))
+                           for stage in list(self.durations)},
+            "errors": {f"{stage}:{cause}": count for (stage, cause), count in self.errors.items()},
+        }
+
+
+# Shared tracer; TWILIGHT_TRACE=path/to/traces.jsonl turns it on and exports traces
+tracer = Tracer(enabled=bool(os.environ.get("TWILIGHT_TRACE")), path=os.environ.get("TWILIGHT_TRACE") or None)
+
+
+def span(stage):
+    return tracer.span(stage)
+
+
+def record_error(stage, exc):
+    tracer.record_error(stage, exc)
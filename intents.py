@@ -0,0 +1,223 @@
+import re
+import json
+import os
+from collections import deque
+
+import instrumentation
+
+# Higher priority wins when several intents match one transcript,
+# then the longer phrase, then the earlier position.
+PRIORITY_EXIT = 40
+PRIORITY_SPECIFIC = 30
+PRIORITY_DEFAULT = 20
+PRIORITY_WAKE = 10
+PRIORITY_GENERIC = 0
+
+MUSIC_URL = "https://www.youtube.com/watch?v=XlOBtQSjYRU&list=RDXlOBtQSjYRU&start_radio=1"
+
+SITES = [
+    ("google", "Google", "https://www.google.com"),
+    ("anime", "anime", "https://hianime.nz"),
+    ("gemini", "Gemini", "https://gemini.google.com"),
+    ("github", "GitHub", "https://github.com/Mrutyunjaypathe"),
+    ("spotify", "Spotify", "https://www.spotify.com"),
+    ("netflix", "Netflix", "https://www.netflix.com"),
+    ("amazon", "Amazon", "https://www.amazon.com"),
+    ("notion", "Notion", "https://www.notion.so"),
+    ("tradingview", "TradingView", "https://in.tradingview.com"),
+    ("chess", "Chess", "https://www.chess.com"),
+    ("linkedin", "LinkedIn", "https://www.linkedin.com"),
+    ("whatsapp", "WhatsApp", "https://web.whatsapp.com"),
+]
+
+# Declarative command table; "action" names a handler supplied by the caller
+COMMANDS = [
+    {"name": "wake", "phrases": ["twilight"], "action": "reply", "reply": "Yes", "priority": PRIORITY_WAKE},
+    {"name": "search_youtube", "action": "youtube_search", "slot": True, "priority": PRIORITY_SPECIFIC,
+     "phrases": ["search youtube for", "search youtube", "youtube search for", "youtube search",
+                 "search on youtube for", "search on youtube"]},
+] + [
+    {"name": f"open_{key}", "phrases": [f"open {key}"], "action": "open_url", "reply": f"Opening {label}",
+     "url": url, "priority": PRIORITY_SPECIFIC}
+    for key, label, url in SITES
+] + [
+    {"name": "time", "phrases": ["current time", "what time is it", "time"], "action": "time"},
+    {"name": "screenshot", "phrases": ["take screenshot", "screenshot", "screenshots"], "action": "screenshot"},
+    {"name": "screenshot_burst", "phrases": ["burst screenshot", "burst screenshots", "screenshot burst"],
+     "action": "screenshot_burst", "priority": PRIORITY_SPECIFIC},
+    {"name": "play_music", "phrases": ["play my music"], "action": "open_url", "reply": "Playing music",
+     "url": MUSIC_URL, "priority": PRIORITY_SPECIFIC},
+    {"name": "who_are_you", "phrases": ["who are you"], "action": "reply", "reply": "I am Twilight robot"},
+    {"name": "how_are_you", "phrases": ["how are you"], "action": "reply", "reply": "I am fine, thank you"},
+    {"name": "open_music", "phrases": ["open"], "action": "open_url", "reply": "Opening music",
+     "url": MUSIC_URL, "exact": True},
+    {"name": "open_other", "phrases": ["open on youtube", "open"], "action": "youtube_open", "slot": True,
+     "priority": PRIORITY_GENERIC},
+    {"name": "thank_you", "phrases": ["thank you"], "action": "reply", "reply": "You're welcome"},
+    {"name": "exit", "phrases": ["bye", "goodbye", "good bye", "exit"], "action": "exit", "priority": PRIORITY_EXIT},
+]
+
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text):
+    return tuple(TOKEN_RE.findall(text.lower()))
+
+
+class Intent:
+    def __init__(self, name, phrases, handler=None, priority=PRIORITY_DEFAULT, slot=False, exact=False, data=None):
+        self.name = name
+        self.phrases = list(phrases)
+        self.handler = handler
+        self.priority = priority
+        self.slot = slot
+        self.exact = exact
+        self.data = data or {}
+
+
+class IntentMatch:
+    def __init__(self, intent, phrase, start, end, tokens, command):
+        self.intent = intent
+        self.phrase = phrase
+        self.start = start
+        self.end = end
+        self.command = command
+        # Slot text is whatever follows the trigger phrase
+        self.slot = " ".join(tokens[end:]) if intent.slot else ""
+
+    @property
+    def name(self):
+        return self.intent.name
+
+
+class IntentRegistry:
+    """Phrase-to-intent registry compiled into a token-level Aho-Corasick automaton."""
+
+    def __init__(self):
+        self.intents = {}
+        # (goto, fail, outputs, exact) of the compiled automaton, None until compiled
+        self._tables = None
+
+    def add(self, name, phrases, handler=None, priority=PRIORITY_DEFAULT, slot=False, exact=False, data=None):
+        intent = Intent(name, phrases, handler, priority, slot, exact, data)
+        self.intents[name] = intent
+        self._tables = None
+        return intent
+
+    def alias(self, phrase, name):
+        intent = self.intents.get(name)
+        if intent is None:
+            raise KeyError(f"Unknown intent: {name}")
+        intent.phrases.append(phrase)
+        self._tables = None
+
+    def load_aliases(self, path):
+        """Add user phrases from a {phrase: intent} JSON file; a broken file or entry is recorded and skipped."""
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                aliases = json.load(f)
+            if not isinstance(aliases, dict):
+                raise ValueError(f"{path}: expected an object of phrase -> intent")
+        except (OSError, ValueError) as e:
+            instrumentation.record_error("aliases", e)
+            return 0
+        loaded = 0
+        for phrase, name in aliases.items():
+            try:
+                self.alias(phrase, name)
+            except (KeyError, TypeError) as e:
+                instrumentation.record_error("aliases", e)
+                continue
+            loaded += 1
+        return loaded
+
+    def compile(self):
+        # Built in locals and swapped in at the end, so a concurrent match() never sees half a table
+        goto = [{}]
+        fail_links = [0]
+        outputs = [[]]
+        exact = {}
+        for intent in self.intents.values():
+            for phrase in intent.phrases:
+                tokens = tokenize(phrase)
+                if not tokens:
+                    continue
+                if intent.exact:
+                    exact[tokens] = intent
+                    continue
+                node = 0
+                for token in tokens:
+                    nxt = goto[node].get(token)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[node][token] = nxt
+                        goto.append({})
+                        fail_links.append(0)
+                        outputs.append([])
+                    node = nxt
+                outputs[node].append((intent, phrase, len(tokens)))
+
+        # Breadth-first failure links, with outputs merged along them
+        pending = deque(goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for token, child in goto[node].items():
+                pending.append(child)
+                fail = fail_links[node]
+                while fail and token not in goto[fail]:
+                    fail = fail_links[fail]
+                target = goto[fail].get(token, 0)
+                fail_links[child] = target if target != child else 0
+                outputs[child] = outputs[child] + outputs[fail_links[child]]
+        self._tables = (goto, fail_links, outputs, exact)
+        return self._tables
+
+    def match(self, command):
+        # One read of the tables, so a recompile on another thread cannot mix old and new
+        goto, fail, outputs, exact = self._tables or self.compile()
+        tokens = tokenize(command)
+        intent = exact.get(tokens)
+        if intent is not None:
+            return IntentMatch(intent, " ".join(tokens), 0, len(tokens), tokens, command)
+
+        best = None
+        best_key = None
+        node = 0
+        # A slot intent owns the tokens after its trigger; plain intents found there are slot text
+        slot_end = len(tokens)
+        for position, token in enumerate(tokens):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            for intent, phrase, length in outputs[node]:
+                start = position + 1 - length
+                if intent.slot:
+                    slot_end = min(slot_end, position + 1)
+                elif start >= slot_end:
+                    continue
+                key = (intent.priority, length, -start)
+                if best_key is None or key > best_key:
+                    best_key = key
+                    best = (intent, phrase, start, position + 1)
+        if best is None:
+            return None
+        return IntentMatch(best[0], best[1], best[2], best[3], tokens, command)
+
+    def dispatch(self, command, fallback=None):
+        match = self.match(command)
+        if match is None:
+            return fallback(command) if fallback else None
+        return match.intent.handler(match)
+
+
+def build_registry(handlers=None, commands=COMMANDS):
+    """Build a registry from a command table, binding each entry's action to handlers[action]."""
+    handlers = handlers or {}
+    registry = IntentRegistry()
+    for command in commands:
+        registry.add(command["name"], command["phrases"], handlers.get(command["action"]),
+                     priority=command.get("priority", PRIORITY_DEFAULT), slot=command.get("slot", False),
+                     exact=command.get("exact", False), data=command)
+    return registry
@@ -0,0 +1,554 @@
+import os
+import re
+import json
+import time
+import hashlib
+import queue
+import tempfile
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import instrumentation
+
+GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+DEFAULT_MODEL = "llama3-8b-8192"
+SYSTEM_PROMPT = "You are Twilight, a helpful robot assistant. Keep responses concise and under 100 words."
+FALLBACK_RESPONSE = "I'm here to help you with various tasks and questions."
+SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+
+
+def transient_status(status):
+    # Worth retrying elsewhere and counted against the endpoint; other errors (401, 400) are the request's fault
+    return status == 429 or status >= 500
+
+
+def normalize_question(question):
+    question = re.sub(r"[^\w\s]", " ", question.lower())
+    return " ".join(question.split())
+
+
+class SentenceSplitter:
+    """Buffers streamed text and releases it one complete sentence at a time."""
+
+    def __init__(self, min_chars=12):
+        self.min_chars = min_chars
+        self.buffer = ""
+
+    def feed(self, text):
+        self.buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_END.finditer(self.buffer):
+            # Very short pieces ("Dr.", "1.") are merged into the next sentence
+            if match.end() - start < self.min_chars:
+                continue
+            sentences.append(self.buffer[start:match.end()].strip())
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self):
+        rest = self.buffer.strip()
+        self.buffer = ""
+        return [rest] if rest else []
+
+
+class ResponseCache:
+    """LRU cache of answers with a time-to-live, optionally persisted as JSON.
+
+    Writes are debounced: a put schedules one background save ``save_delay``
+    seconds later, so answers never wait on the disk. Call flush() on shutdown.
+    """
+
+    def __init__(self, max_entries=512, ttl_seconds=24 * 3600, path=None, save_delay=1.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.save_delay = save_delay
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.save_timer = None
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        if path:
+            self.load()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            # Stored with wall-clock expiry so entries survive restarts
+            if entry[0] < time.time():
+                del self.entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.time() + self.ttl_seconds, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            if self.path and self.save_timer is None:
+                self.save_timer = threading.Timer(self.save_delay, self.flush)
+                self.save_timer.daemon = True
+                self.save_timer.start()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        with self.lock:
+            for key, expires, value in stored[-self.max_entries:]:
+                if expires > now:
+                    self.entries[key] = (expires, value)
+
+    def flush(self):
+        """Write any pending changes now."""
+        with self.lock:
+            timer, self.save_timer = self.save_timer, None
+        if timer is None:
+            return
+        timer.cancel()
+        self.save()
+
+    def save(self):
+        # One writer at a time, each through its own temp file next to the cache
+        with self.save_lock:
+            with self.lock:
+                stored = [[key, expires, value] for key, (expires, value) in self.entries.items()]
+            fd, tmp_path = tempfile.mkstemp(prefix=".llm_cache", suffix=".tmp",
+                                            dir=os.path.dirname(os.path.abspath(self.path)))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(stored, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class CircuitOpenError(Exception):
+    """No endpoint is currently accepting requests; answer with the fallback right away."""
+
+
+class LatencyWindow:
+    """Recent successful request latencies, in seconds."""
+
+    def __init__(self, size=100, min_samples=5):
+        self.samples = deque(maxlen=size)
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, p):
+        with self.lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            samples = sorted(self.samples)
+        return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures so callers fail fast; a background probe closes it again.
+
+    The probe interval doubles after each failed probe, up to ``max_probe_interval``.
+    """
+
+    def __init__(self, failure_threshold=3, probe_interval=5.0, probe=None, max_probe_interval=60.0):
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.max_probe_interval = max_probe_interval
+        self.probe = probe
+        self.open = False
+        self.consecutive_failures = 0
+        self.opened = 0
+        self.probes = 0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        return not self.open
+
+    def record_success(self):
+        with self.lock:
+            self.consecutive_failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.consecutive_failures += 1
+            # A threshold of 0 disables the breaker
+            if self.open or not self.failure_threshold or self.consecutive_failures < self.failure_threshold:
+                return
+            self.open = True
+            self.opened += 1
+        threading.Thread(target=self._probe_loop, daemon=True).start()
+
+    def _probe_loop(self):
+        interval = self.probe_interval
+        while self.open:
+            time.sleep(interval)
+            self.probes += 1
+            try:
+                healthy = self.probe() if self.probe else True
+            except Exception:
+                healthy = False
+            interval = min(interval * 2, max(self.max_probe_interval, self.probe_interval))
+            if healthy:
+                with self.lock:
+                    self.open = False
+                    self.consecutive_failures = 0
+
+    def state(self):
+        return "open" if self.open else "closed"
+
+
+class Endpoint:
+    """One chat completions endpoint with its own latency history and circuit breaker."""
+
+    def __init__(self, url, api_key, model, failure_threshold=3, probe_interval=5.0):
+        self.url = url
+        self.model = model
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+        # Kept apart: streamed requests are timed to the response headers, plain ones to the full body
+        self.latency = {False: LatencyWindow(), True: LatencyWindow()}
+        self.breaker = CircuitBreaker(failure_threshold, probe_interval)
+        self.failures = 0
+
+    def stats(self):
+        pick = lambda stream, p: self.latency[stream].percentile(p)
+        ms = lambda value: round(value * 1000, 1) if value is not None else None
+        return {
+            "url": self.url,
+            "model": self.model,
+            "state": self.breaker.state(),
+            "failures": self.failures,
+            "opened": self.breaker.opened,
+            "probes": self.breaker.probes,
+            "p50_ms": ms(pick(False, 50)),
+            "p95_ms": ms(pick(False, 95)),
+            "stream_p50_ms": ms(pick(True, 50)),
+            "stream_p95_ms": ms(pick(True, 95)),
+        }
+
+
+class LLMClient:
+    """Chat completions client on one keep-alive, connection-pooled session.
+
+    Timeouts follow the endpoint's recent latency (``timeout_factor`` x p99,
+    between ``min_timeout`` and ``timeout``). After ``failure_threshold``
+    consecutive failures an endpoint's circuit opens: questions get the
+    fallback at once while a background probe waits for it to recover.
+    ``secondary`` (a dict with url/model/api_key) is used while the primary
+    is open and, with ``hedge``, raced against a primary request that is
+    already slower than its p95.
+    """
+
+    def __init__(self, url=GROQ_URL, api_key=None, model=DEFAULT_MODEL, max_tokens=100, temperature=0.7,
+                 system_prompt=SYSTEM_PROMPT, timeout=10, cache=None, pool_size=4, adaptive_timeout=True,
+                 min_timeout=2.0, timeout_factor=3.0, failure_threshold=3, probe_interval=5.0,
+                 hedge=False, secondary=None):
+        self.url = url
+        self.api_key = api_key or os.environ.get("GROQ_API_KEY", "ENTER_YOUR_API_KEY_HERE")
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.system_prompt = system_prompt
+        self.timeout = timeout
+        self.cache = cache
+        self.pool_size = pool_size
+        self.adaptive_timeout = adaptive_timeout
+        self.min_timeout = min_timeout
+        self.timeout_factor = timeout_factor
+        self.hedge = hedge
+        self.endpoints = [Endpoint(url, self.api_key, model, failure_threshold, probe_interval)]
+        if secondary:
+            self.endpoints.append(Endpoint(secondary.get("url", url), secondary.get("api_key", self.api_key),
+                                           secondary.get("model", model), failure_threshold, probe_interval))
+        for endpoint in self.endpoints:
+            endpoint.breaker.probe = lambda endpoint=endpoint: self._probe(endpoint)
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.short_circuits = 0
+        self.executor = None
+        self.requests = None
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._connect()
+        return self._session
+
+    def _connect(self):
+        # requests is only imported once the session is first needed, keeping startup light
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.requests = requests
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        })
+        return session
+
+    def warm(self):
+        """Open a pooled connection (DNS, TCP, TLS) before the first question needs it."""
+        session = self.session
+        try:
+            with instrumentation.span("llm_warm"):
+                session.head(self.url, timeout=self.timeout)
+        except self.requests.RequestException as e:
+            instrumentation.record_error("llm_warm", e)
+
+    def payload(self, question):
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": question}
+            ],
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature
+        }
+
+    def timeout_for(self, endpoint, stream=False):
+        if not self.adaptive_timeout:
+            return self.timeout
+        p99 = endpoint.latency[stream].percentile(99)
+        if p99 is None:
+            return self.timeout
+        return max(self.min_timeout, min(self.timeout, p99 * self.timeout_factor))
+
+    def _send(self, endpoint, payload, stream=False):
+        start = time.monotonic()
+        try:
+            response = self.session.post(endpoint.url, json=dict(payload, model=endpoint.model),
+                                         headers=endpoint.headers, timeout=self.timeout_for(endpoint, stream),
+                                         stream=stream)
+            if response.status_code != 200:
+                response.close()
+                raise self.requests.HTTPError(f"status {response.status_code}", response=response)
+        except self.requests.RequestException as e:
+            self._failed(endpoint, e)
+            raise
+        endpoint.latency[stream].record(time.monotonic() - start)
+        endpoint.breaker.record_success()
+        return response
+
+    def _failed(self, endpoint, error):
+        endpoint.failures += 1
+        # Timeouts, connection errors, 5xx and 429 say the endpoint is in trouble; a bad key does not
+        response = getattr(error, "response", None)
+        if response is None or transient_status(response.status_code):
+            endpoint.breaker.record_failure()
+
+    def _request(self, payload, stream=False):
+        """Send to the first endpoint whose circuit is closed, hedging when enabled."""
+        endpoints = [e for e in self.endpoints if e.breaker.allow()]
+        if not endpoints:
+            self.short_circuits += 1
+            raise CircuitOpenError("all LLM endpoints are failing")
+        primary = endpoints[0]
+        delay = primary.latency[stream].percentile(95) if self.hedge else None
+        if delay is None:
+            if len(endpoints) == 1:
+                return primary, self._send(primary, payload, stream)
+            try:
+                return primary, self._send(primary, payload, stream)
+            except self.requests.RequestException:
+                # Retry this question on the secondary rather than waiting for the circuit to open
+                return endpoints[1], self._send(endpoints[1], payload, stream)
+        backup = endpoints[1] if len(endpoints) > 1 else primary
+        return self._hedged(primary, backup, payload, stream, delay)
+
+    def _hedged(self, primary, backup, payload, stream, delay):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.pool_size * 2, thread_name_prefix="llm-hedge")
+        results = queue.Queue()
+
+        def attempt(index, endpoint):
+            try:
+                results.put((index, endpoint, self._send(endpoint, payload, stream), None))
+            except Exception as e:
+                results.put((index, endpoint, None, e))
+
+        self.executor.submit(attempt, 0, primary)
+        launched = 1
+        try:
+            outcome = results.get(timeout=delay)
+        except queue.Empty:
+            # Already slower than 95% of recent requests: race a second one
+            self.hedges += 1
+            self.executor.submit(attempt, 1, backup)
+            launched = 2
+            outcome = results.get()
+        received = 1
+        while outcome[3] is not None and received < launched:
+            outcome = results.get()
+            received += 1
+        if received < launched:
+            # Close the losing response whenever it turns up
+            self.executor.submit(self._discard, results)
+        index, endpoint, response, error = outcome
+        if error is not None:
+            if launched == 1 and backup is not primary and isinstance(error, self.requests.RequestException):
+                # The primary failed before the hedge delay: fail over as the unhedged path does
+                return backup, self._send(backup, payload, stream)
+            raise error
+        if index == 1:
+            self.hedge_wins += 1
+        return endpoint, response
+
+    def _discard(self, results):
+        response = results.get()[2]
+        if response is not None:
+            response.close()
+
+    def _probe(self, endpoint):
+        payload = dict(self.payload("ping"), max_tokens=1)
+        response = self.session.post(endpoint.url, json=dict(payload, model=endpoint.model),
+                                     headers=endpoint.headers, timeout=self.timeout)
+        response.close()
+        return not transient_status(response.status_code)
+
+    def cache_key(self, question):
+        params = [normalize_question(question), self.model, self.max_tokens, self.temperature, self.system_prompt]
+        return hashlib.sha1(json.dumps(params).encode("utf-8")).hexdigest()
+
+    def ask(self, question):
+        key = self.cache_key(question) if self.cache else None
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        self.session
+        try:
+            with instrumentation.span("llm"):
+                endpoint, response = self._request(self.payload(question))
+                answer = response.json()['choices'][0]['message']['content']
+        except (self.requests.RequestException, CircuitOpenError, ValueError, KeyError, IndexError) as e:
+            instrumentation.record_error("llm", e)
+            return FALLBACK_RESPONSE
+        if key:
+            self.cache.put(key, answer)
+        return answer
+
+    def stream(self, question):
+        """Yield answer text deltas from a ``stream: true`` server-sent-events response."""
+        payload = self.payload(question)
+        payload["stream"] = True
+        endpoint, response = self._request(payload, stream=True)
+        with response:
+            try:
+                # SSE is always UTF-8; requests would guess ISO-8859-1 for a text/* type without a charset
+                for line in response.iter_lines(chunk_size=None):
+                    line = line.decode("utf-8")
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        return
+                    delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+            except self.requests.RequestException as e:
+                # Stalled or dropped mid-answer
+                self._failed(endpoint, e)
+                raise
+
+    def ask_sentences(self, question):
+        """Yield the answer sentence by sentence while it is still being generated."""
+        key = self.cache_key(question) if self.cache else None
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                splitter = SentenceSplitter()
+                yield from splitter.feed(cached + " ")
+                yield from splitter.flush()
+                return
+        # Connects up front so self.requests is set for the except clause below
+        self.session
+        splitter = SentenceSplitter()
+        parts = []
+        sent_any = False
+        trace = instrumentation.tracer.current()
+        start = time.monotonic()
+        try:
+            for delta in self.stream(question):
+                parts.append(delta)
+                for sentence in splitter.feed(delta):
+                    if not sent_any:
+                        trace.add_span("llm_first_sentence", start, time.monotonic())
+                    sent_any = True
+                    yield sentence
+        except (self.requests.RequestException, CircuitOpenError, ValueError, KeyError, IndexError) as e:
+            trace.add_span("llm", start, time.monotonic())
+            instrumentation.record_error("llm", e)
+            if not sent_any:
+                yield FALLBACK_RESPONSE
+            return
+        trace.add_span("llm", start, time.monotonic())
+        for sentence in splitter.flush():
+            sent_any = True
+            yield sentence
+        if not sent_any:
+            yield FALLBACK_RESPONSE
+        elif key:
+            self.cache.put(key, "".join(parts))
+
+    def stats(self):
+        return {
+            "endpoints": [endpoint.stats() for endpoint in self.endpoints],
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "short_circuits": self.short_circuits,
+        }
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.flush()
+        for endpoint in self.endpoints:
+            # Stops the probe threads
+            endpoint.breaker.open = False
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+        if self._session is not None:
+            self._session.close()
@@ -0,0 +1,197 @@
+import time
+import queue
+import threading
+import instrumentation
+
+# Returned by a dispatch handler to shut the pipeline down
+STOP = object()
+
+
+class Interaction:
+    """One command's trip through the pipeline, with monotonic stage timestamps."""
+
+    def __init__(self, utterance, trace=instrumentation.NULL_TRACE):
+        self.utterance = utterance
+        self.trace = trace
+        self.text = None
+        self.result = None
+        self.error = None
+        self.cancelled = threading.Event()
+        # Heard while the assistant was talking, so possibly its own voice
+        self.during_playback = False
+        self.times = {"captured": getattr(utterance, "ended", None) or time.monotonic()}
+
+    def mark(self, stage):
+        self.times[stage] = time.monotonic()
+
+    def latency(self, start="captured", end="done"):
+        if start in self.times and end in self.times:
+            return self.times[end] - self.times[start]
+        return None
+
+
+class VoicePipeline:
+    """Capture -> recognize -> dispatch -> speak, each stage on its own thread.
+
+    Stages are plain callables or objects so any of them can be replaced by a stub:
+    ``source.get(timeout)`` returns utterances, ``recognize(utterance)`` returns text
+    or None, ``dispatch(text)`` runs the command, and ``speaker`` offers ``busy()``
+    and ``interrupt()`` for barge-in.
+
+    The microphone stays open during playback, so anything heard while the speaker
+    is busy is only acted on when it starts with the wake word; the rest is taken
+    to be the assistant's own voice and dropped.
+    """
+
+    def __init__(self, source, recognize, dispatch, speaker=None, on_status=None, on_complete=None,
+                 on_stop=None, wake_word="twilight", queue_size=4, tracer=None):
+        self.source = source
+        self.tracer = tracer or instrumentation.tracer
+        self.recognize = recognize
+        self.dispatch = dispatch
+        self.speaker = speaker
+        self.on_status = on_status
+        self.on_complete = on_complete
+        self.on_stop = on_stop
+        self.wake_word = wake_word
+        self.recognition_queue = queue.Queue(maxsize=queue_size)
+        self.dispatch_queue = queue.Queue(maxsize=queue_size)
+        self.current = None
+        self.running = False
+        self.stopped = threading.Event()
+        self.dropped = 0
+        self.echoes = 0
+        self.barge_ins = 0
+        self.onset_during_playback = False
+        self.threads = []
+
+    def start(self):
+        self.running = True
+        for target in (self._capture_loop, self._recognize_loop, self._dispatch_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def stop(self):
+        self.running = False
+        self.stopped.set()
+        for thread in self.threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=2)
+
+    def wait(self, timeout=None):
+        return self.stopped.wait(timeout)
+
+    def speaking(self):
+        return self.speaker is not None and self.speaker.busy()
+
+    def speech_started(self):
+        self.onset_during_playback = self.speaking()
+        self.status("Listening...")
+
+    def status(self, text):
+        if self.on_status:
+            self.on_status(text)
+
+    def barge_in(self):
+        self.barge_ins += 1
+        current = self.current
+        if current is not None:
+            current.cancelled.set()
+        if self.speaker is not None:
+            self.speaker.interrupt()
+
+    def busy(self):
+        return self.current is not None or (self.speaker is not None and self.speaker.busy())
+
+    def _offer(self, target, item):
+        # Bounded queues: wait briefly, then drop rather than fall further behind
+        try:
+            target.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _capture_loop(self):
+        while self.running:
+            try:
+                utterance = self.source.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            trace = self.tracer.begin()
+            started = getattr(utterance, "started", None)
+            if started is not None:
+                trace.add_span("listen", started, utterance.ended)
+            interaction = Interaction(utterance, trace)
+            interaction.during_playback = self.onset_during_playback or self.speaking()
+            self.onset_during_playback = False
+            if not self._offer(self.recognition_queue, interaction):
+                trace.error("capture", queue.Full())
+
+    def _recognize_loop(self):
+        while self.running:
+            try:
+                interaction = self.recognition_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            self.status("Processing...")
+            interaction.mark("recognize_start")
+            self.tracer.activate(interaction.trace)
+            try:
+                with interaction.trace.span("recognize"):
+                    interaction.text = self.recognize(interaction.utterance)
+            except Exception as e:
+                interaction.error = e
+            finally:
+                self.tracer.activate(instrumentation.NULL_TRACE)
+            interaction.mark("recognized")
+            interaction.trace.text = interaction.text
+            if not interaction.text:
+                self._finish(interaction)
+                continue
+            addressed = bool(self.wake_word) and interaction.text.lower().lstrip().startswith(self.wake_word)
+            if interaction.during_playback and not addressed:
+                self.echoes += 1
+                self._finish(interaction)
+                continue
+            # A wake word while a command is still running interrupts it
+            if self.wake_word and self.wake_word in interaction.text and self.busy():
+                self.barge_in()
+            if not self._offer(self.dispatch_queue, interaction):
+                interaction.trace.error("recognize", queue.Full())
+                self._finish(interaction)
+
+    def _dispatch_loop(self):
+        while self.running:
+            try:
+                interaction = self.dispatch_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            self.current = interaction
+            interaction.mark("dispatch_start")
+            self.tracer.activate(interaction.trace)
+            try:
+                with interaction.trace.span("dispatch"):
+                    interaction.result = self.dispatch(interaction.text)
+            except Exception as e:
+                interaction.error = e
+            finally:
+                self.current = None
+                self.tracer.activate(instrumentation.NULL_TRACE)
+            self._finish(interaction)
+            if interaction.result is STOP:
+                self.running = False
+                self.stopped.set()
+                if self.on_stop:
+                    self.on_stop()
+                return
+
+    def _finish(self, interaction):
+        interaction.mark("done")
+        self.tracer.finish(interaction.trace)
+        if self.recognition_queue.empty() and self.dispatch_queue.empty():
+            self.status("Ready")
+        if self.on_complete:
+            self.on_complete(interaction)
@@ -0,0 +1,260 @@
+import os
+import math
+import importlib.util
+import time
+import glob
+import wave
+from array import array
+
+WAKE_TEMPLATE_DIR = os.path.join(os.getcwd(), "wake_templates")
+
+
+class RecognitionError(Exception):
+    """A backend could not produce a transcript (network, quota, engine failure)."""
+
+
+class GoogleBackend:
+    name = "google"
+
+    def __init__(self, recognizer=None):
+        import speech_recognition as sr
+        self.sr = sr
+        self.recognizer = recognizer or sr.Recognizer()
+
+    def transcribe(self, utterance):
+        try:
+            return self.recognizer.recognize_google(utterance.to_audio_data()).lower()
+        except self.sr.UnknownValueError:
+            return None
+        except self.sr.RequestError as e:
+            raise RecognitionError(str(e)) from e
+
+
+class SphinxBackend:
+    """Offline CMU Sphinx through speech_recognition (needs the pocketsphinx package)."""
+
+    name = "sphinx"
+
+    def __init__(self, recognizer=None):
+        import speech_recognition as sr
+        self.sr = sr
+        self.recognizer = recognizer or sr.Recognizer()
+
+    def transcribe(self, utterance):
+        try:
+            return self.recognizer.recognize_sphinx(utterance.to_audio_data()).lower()
+        except self.sr.UnknownValueError:
+            return None
+        except self.sr.RequestError as e:
+            raise RecognitionError(str(e)) from e
+
+
+class StubBackend:
+    """Returns canned transcripts, e.g. keyed by fixture name, with optional delay and failures."""
+
+    name = "stub"
+
+    def __init__(self, transcripts=None, default=None, delay=0.0, fail=False, name=None):
+        self.transcripts = transcripts or {}
+        self.default = default
+        self.delay = delay
+        self.fail = fail
+        if name:
+            self.name = name
+
+    def transcribe(self, utterance):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise RecognitionError(f"{self.name} unavailable")
+        key = getattr(utterance, "name", None)
+        if key is None and isinstance(utterance, str):
+            key = utterance
+        return self.transcripts.get(key, self.default)
+
+
+def default_backends(recognizer=None):
+    """Backends in the order named by TWILIGHT_RECOGNIZERS (default: google, then sphinx if installed)."""
+    names = os.environ.get("TWILIGHT_RECOGNIZERS", "google,sphinx").split(",")
+    backends = []
+    for name in (n.strip() for n in names):
+        if name == "google":
+            backends.append(GoogleBackend(recognizer))
+        elif name == "sphinx" and importlib.util.find_spec("pocketsphinx") is not None:
+            backends.append(SphinxBackend(recognizer))
+    return backends
+
+
+class BackendStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+        self.last_error = None
+        self.skip_until = 0.0
+
+    def record(self, elapsed_ms, error=None):
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        self.avg_ms = elapsed_ms if self.calls == 1 else 0.8 * self.avg_ms + 0.2 * elapsed_ms
+        if error is None:
+            self.consecutive_errors = 0
+        else:
+            self.errors += 1
+            self.consecutive_errors += 1
+            self.last_error = error
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.avg_ms, 1),
+            "last_ms": round(self.last_ms, 1),
+            "last_error": str(self.last_error) if self.last_error else None,
+        }
+
+
+class RecognizerChain:
+    """Tries transcription backends in order, skipping ones that are failing or slow."""
+
+    def __init__(self, backends, slow_ms=4000, max_errors=3, cooldown_seconds=30):
+        self.backends = list(backends)
+        self.slow_ms = slow_ms
+        self.max_errors = max_errors
+        self.cooldown_seconds = cooldown_seconds
+        self.stats = {backend.name: BackendStats() for backend in self.backends}
+
+    def available(self):
+        now = time.monotonic()
+        ready = [b for b in self.backends if self.stats[b.name].skip_until <= now]
+        # Never leave nothing to try
+        return ready or self.backends
+
+    def transcribe(self, utterance):
+        last_error = None
+        for backend in self.available():
+            stats = self.stats[backend.name]
+            start = time.perf_counter()
+            try:
+                text = backend.transcribe(utterance)
+            except RecognitionError as e:
+                stats.record((time.perf_counter() - start) * 1000, e)
+                if stats.consecutive_errors >= self.max_errors:
+                    stats.skip_until = time.monotonic() + self.cooldown_seconds
+                last_error = e
+                continue
+            stats.record((time.perf_counter() - start) * 1000)
+            if stats.avg_ms > self.slow_ms and len(self.backends) > 1:
+                # Too slow on average: let the next backend lead for a while
+                stats.skip_until = time.monotonic() + self.cooldown_seconds
+            return text
+        raise last_error or RecognitionError("no recognition backend available")
+
+    def report(self):
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
+
+
+def features(data, sample_rate, frame_ms=20):
+    """Per-frame (log energy, zero-crossing rate), with energy relative to the loudest frame."""
+    samples = array("h", data)
+    size = max(1, sample_rate * frame_ms // 1000)
+    frames = []
+    for start in range(0, len(samples) - size + 1, size):
+        chunk = samples[start:start + size]
+        energy = sum(s * s for s in chunk) / size
+        crossings = sum(1 for a, b in zip(chunk, chunk[1:]) if (a < 0) != (b < 0)) / size
+        frames.append([10 * math.log10(energy + 1.0), crossings * 10])
+    if frames:
+        peak = max(f[0] for f in frames)
+        for f in frames:
+            f[0] = (f[0] - peak) / 10
+    return frames
+
+
+def dtw_distance(template, candidate, band=None):
+    """Open-end DTW: how well the start of ``candidate`` matches ``template``, per template frame."""
+    n, m = len(template), len(candidate)
+    if not n or not m:
+        return float("inf")
+    band = band or max(n, m)
+    inf = float("inf")
+    previous = [inf] * (m + 1)
+    previous[0] = 0.0
+    for i in range(1, n + 1):
+        current = [inf] * (m + 1)
+        t0, t1 = template[i - 1]
+        for j in range(max(1, i - band), min(m, i + band) + 1):
+            c0, c1 = candidate[j - 1]
+            cost = abs(t0 - c0) + abs(t1 - c1)
+            current[j] = cost + min(previous[j], previous[j - 1], current[j - 1])
+        previous = current
+    return min(previous[1:]) / n
+
+
+class TemplateWakeWord:
+    """Cheap local wake-word detector: DTW against a few enrolled recordings of the wake word."""
+
+    def __init__(self, templates=None, threshold=0.6, frame_ms=20):
+        self.templates = list(templates or [])
+        self.threshold = threshold
+        self.frame_ms = frame_ms
+        self.last_score = None
+
+    @classmethod
+    def from_directory(cls, directory=WAKE_TEMPLATE_DIR, **kwargs):
+        detector = cls(**kwargs)
+        for path in sorted(glob.glob(os.path.join(directory, "*.wav"))):
+            detector.enroll_wav(path)
+        return detector
+
+    def enroll(self, data, sample_rate):
+        self.templates.append(features(data, sample_rate, self.frame_ms))
+
+    def enroll_wav(self, path):
+        with wave.open(path, "rb") as w:
+            self.enroll(w.readframes(w.getnframes()), w.getframerate())
+
+    def enabled(self):
+        return bool(self.templates)
+
+    def detect(self, utterance):
+        if not self.templates:
+            return True
+        # The wake word opens the utterance, so only its first couple of seconds are scored
+        frames = int(max(len(t) for t in self.templates) * 1.5) + 300 // self.frame_ms
+        size = utterance.sample_rate * self.frame_ms // 1000 * 2
+        candidate = features(utterance.data[:frames * size], utterance.sample_rate, self.frame_ms)
+        self.last_score = min(dtw_distance(t, candidate, band=len(t) // 2 + 5) for t in self.templates)
+        return self.last_score <= self.threshold
+
+
+class GatedRecognizer:
+    """Runs the local wake-word stage first and only pays for full transcription when it fires."""
+
+    def __init__(self, wake_word, chain):
+        self.wake_word = wake_word
+        self.chain = chain
+        self.gated = 0
+        self.passed = 0
+        self.wake_ms = 0.0
+
+    def __call__(self, utterance):
+        return self.transcribe(utterance)
+
+    def transcribe(self, utterance):
+        start = time.perf_counter()
+        woke = self.wake_word.detect(utterance)
+        self.wake_ms = (time.perf_counter() - start) * 1000
+        if not woke:
+            self.gated += 1
+            return None
+        self.passed += 1
+        return self.chain.transcribe(utterance)
+
+    def report(self):
+        return {"wake": {"gated": self.gated, "passed": self.passed, "last_ms": round(self.wake_ms, 2)},
+                "backends": self.chain.report()}
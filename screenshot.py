@@ -0,0 +1,237 @@
+import os
+import time
+import hashlib
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+from PyQt5.QtGui import QGuiApplication, QImage, QColor, QImageWriter
+
+import instrumentation
+
+SCREENSHOT_DIR = os.path.join(os.getcwd(), "screenshots")
+
+
+class QtScreenSource(QObject):
+    """Grabs the primary screen in-process; grabs from other threads are run on the GUI thread."""
+
+    grab_requested = pyqtSignal()
+
+    def __init__(self, screen=None, timeout=2.0):
+        super().__init__()
+        self.screen = screen
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._image = None
+        self._error = None
+        app = QGuiApplication.instance()
+        if app is not None and self.thread() != app.thread():
+            self.moveToThread(app.thread())
+        self.grab_requested.connect(self._grab_on_gui_thread)
+
+    def grab(self):
+        if QGuiApplication.instance() is None:
+            raise RuntimeError("screen capture needs a running Qt application")
+        if QThread.currentThread() == self.thread():
+            return self._grab()
+        # QPixmap is only safe on the GUI thread; hand the grab over and wait for it
+        with self._lock:
+            self._done.clear()
+            self._image = self._error = None
+            self.grab_requested.emit()
+            if not self._done.wait(self.timeout):
+                raise TimeoutError("screen grab timed out")
+            if self._error is not None:
+                raise self._error
+            return self._image
+
+    def _grab_on_gui_thread(self):
+        try:
+            self._image = self._grab()
+        except Exception as e:
+            self._error = e
+        self._done.set()
+
+    def _grab(self):
+        screen = self.screen or QGuiApplication.primaryScreen()
+        if screen is None:
+            raise RuntimeError("no screen available")
+        image = screen.grabWindow(0).toImage()
+        if image.isNull():
+            raise RuntimeError("screen grab returned an empty image")
+        return image
+
+
+class SyntheticSource:
+    """Cycles through given images, or solid colour frames, for headless runs."""
+
+    def __init__(self, images=None, width=640, height=360, colors=("#202040",)):
+        if images is None:
+            images = []
+            for color in colors:
+                image = QImage(width, height, QImage.Format_RGB32)
+                image.fill(QColor(color))
+                images.append(image)
+        self.images = list(images)
+        self.grabs = 0
+
+    def grab(self):
+        image = self.images[self.grabs % len(self.images)]
+        self.grabs += 1
+        return image
+
+
+def image_digest(image):
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    return (image.width(), image.height(), image.format(), hashlib.sha1(bits).digest())
+
+
+def supported_format(fmt):
+    return fmt.encode() in [bytes(f) for f in QImageWriter.supportedImageFormats()]
+
+
+def gather(futures):
+    """A future resolving to the results of ``futures`` once every one of them is done."""
+    combined = Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def finished(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            combined.set_result([future.result() for future in futures])
+
+    if not futures:
+        combined.set_result([])
+    for future in futures:
+        future.add_done_callback(finished)
+    return combined
+
+
+class ScreenshotService:
+    """Grabs in-process and encodes/writes on a thread pool; captures return futures.
+
+    A future resolves to ``(filepath, filename)``, or ``(None, None)`` when the
+    capture failed. A frame identical to the previous one is not written again:
+    its capture returns the previous frame's future instead.
+    """
+
+    def __init__(self, source=None, directory=SCREENSHOT_DIR, image_format="png", quality=-1,
+                 workers=2, skip_duplicates=True, burst_count=5, burst_interval=0.2):
+        self.source = source or QtScreenSource()
+        self.directory = directory
+        if not supported_format(image_format):
+            # WebP needs the Qt image format plugins; PNG is always available
+            image_format = "png"
+        self.image_format = image_format
+        self.quality = quality
+        self.skip_duplicates = skip_duplicates
+        self.burst_count = burst_count
+        self.burst_interval = burst_interval
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screenshot")
+        # Bursts sleep between frames, so they get their own thread rather than a writer
+        self.bursts = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot-burst")
+        self.lock = threading.Lock()
+        self.last_digest = None
+        self.last_future = None
+        self.sequence = 0
+        self.captured = 0
+        self.skipped = 0
+        self.written = 0
+        self.errors = 0
+        self.grab_ms = 0.0
+
+    def capture(self):
+        try:
+            with instrumentation.span("screenshot"):
+                start = time.perf_counter()
+                image = self.source.grab()
+                self.grab_ms = (time.perf_counter() - start) * 1000
+                digest = image_digest(image) if self.skip_duplicates else None
+        except Exception as e:
+            instrumentation.record_error("screenshot", e)
+            self.errors += 1
+            future = Future()
+            future.set_result((None, None))
+            return future
+
+        with self.lock:
+            self.captured += 1
+            if digest is not None and digest == self.last_digest:
+                self.skipped += 1
+                return self.last_future
+            self.sequence += 1
+            filename = self.filename(self.sequence)
+            future = self.executor.submit(self._write, image, filename)
+            self.last_digest = digest
+            self.last_future = future
+        return future
+
+    def burst(self, count=None, interval=None):
+        """Capture ``count`` frames ``interval`` seconds apart on a background thread.
+
+        Returns at once with a future that resolves to the results of the new
+        frames only. Unchanged frames are skipped, including a first frame
+        identical to the last capture before the burst, so the list can be empty.
+        """
+        count = count or self.burst_count
+        interval = self.burst_interval if interval is None else interval
+        with self.lock:
+            earlier = self.last_future
+        combined = Future()
+
+        def captured(frames):
+            if frames.exception() is not None:
+                combined.set_exception(frames.exception())
+            else:
+                gather(frames.result()).add_done_callback(lambda done: combined.set_result(done.result()))
+
+        self.bursts.submit(self._burst, count, interval, earlier).add_done_callback(captured)
+        return combined
+
+    def _burst(self, count, interval, earlier):
+        futures = []
+        for i in range(count):
+            if i and interval:
+                time.sleep(interval)
+            future = self.capture()
+            if future is not earlier and future not in futures:
+                futures.append(future)
+        return futures
+
+    def filename(self, sequence):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"screenshot_{timestamp}_{sequence:03d}.{self.image_format}"
+
+    def _write(self, image, filename):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            filepath = os.path.join(self.directory, filename)
+            if not image.save(filepath, self.image_format.upper(), self.quality):
+                raise OSError(f"could not write {filepath}")
+            with self.lock:
+                self.written += 1
+            return filepath, filename
+        except Exception as e:
+            instrumentation.record_error("screenshot", e)
+            with self.lock:
+                self.errors += 1
+            return None, None
+
+    def stats(self):
+        return {
+            "captured": self.captured,
+            "skipped": self.skipped,
+            "written": self.written,
+            "errors": self.errors,
+            "grab_ms": round(self.grab_ms, 2),
+        }
+
+    def close(self):
+        self.bursts.shutdown(wait=True)
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,147 @@
+import math
+
+from PyQt5.QtCore import QPointF
+from PyQt5.QtGui import QPolygonF
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class RingGeometry:
+    """Ring polygons for the plasma sphere, computed once per time value.
+
+    The unit ellipse is built a single time, every ring rotation for a frame
+    is produced in one batched operation and the resulting polygons are kept
+    in a table keyed by ``time`` (which wraps at 360), so steady-state frames
+    only translate ready-made polygons to the widget centre.
+    """
+
+    def __init__(self, ring_radius, ring_count=8, step=3, flatten=0.3,
+                 angle_spacing=22.5, speed=0.5, use_numpy=True):
+        self.ring_radius = ring_radius
+        self.ring_count = ring_count
+        self.step = step
+        self.flatten = flatten
+        self.angle_spacing = angle_spacing
+        self.speed = speed
+        self.use_numpy = use_numpy and np is not None
+        self._table = {}
+
+        # Unit ellipse, scaled to the ring radius and flattened for the 3D look
+        angles = [math.radians(a) for a in range(0, 360, step)]
+        self._base_x = [ring_radius * math.cos(a) for a in angles]
+        self._base_y = [ring_radius * flatten * math.sin(a) for a in angles]
+        if self.use_numpy:
+            self._np_base_x = np.array(self._base_x)
+            self._np_base_y = np.array(self._base_y)
+            self._np_offsets = np.arange(ring_count) * angle_spacing
+
+    def rotations(self, time):
+        return [time * self.speed + i * self.angle_spacing for i in range(self.ring_count)]
+
+    def ring_points(self, time):
+        """Return ring points around the origin as ``[ring][point] -> (x, y)``."""
+        if self.use_numpy:
+            rot = np.radians(time * self.speed + self._np_offsets)[:, None]
+            cos_r = np.cos(rot)
+            sin_r = np.sin(rot)
+            points = np.empty((self.ring_count, len(self._base_x), 2))
+            points[:, :, 0] = self._np_base_x * cos_r - self._np_base_y * sin_r
+            points[:, :, 1] = self._np_base_x * sin_r + self._np_base_y * cos_r
+            return points
+
+        rings = []
+        for rotation in self.rotations(time):
+            rot_rad = math.radians(rotation)
+            cos_r = math.cos(rot_rad)
+            sin_r = math.sin(rot_rad)
+            rings.append([(x * cos_r - y * sin_r, x * sin_r + y * cos_r)
+                          for x, y in zip(self._base_x, self._base_y)])
+        return rings
+
+    def polygons(self, time, center_x=0, center_y=0):
+        """Return one closed ``QPolygonF`` per ring, centred on the given point."""
+        key = time % 360
+        polygons = self._table.get(key)
+        if polygons is None:
+            polygons = [_to_polygon(ring) for ring in self.ring_points(key)]
+            self._table[key] = polygons
+        if center_x or center_y:
+            offset = QPointF(center_x, center_y)
+            return [polygon.translated(offset) for polygon in polygons]
+        return polygons
+
+    def clear(self):
+        self._table.clear()
+
+
+class StreamGeometry:
+    """Wavy circular energy streams, one closed polygon per stream, tabled by ``time``."""
+
+    def __init__(self, radius, streams, step=5, waves=3, use_numpy=True):
+        self.radius = radius
+        self.streams = streams
+        self.step = step
+        self.waves = waves
+        self.use_numpy = use_numpy and np is not None
+        self._table = {}
+        self._angles = list(range(0, 360, step))
+        self._cos = [math.cos(math.radians(a)) for a in self._angles]
+        self._sin = [math.sin(math.radians(a)) for a in self._angles]
+        if self.use_numpy:
+            self._np_angles = np.array(self._angles, dtype=float)
+            self._np_cos = np.array(self._cos)
+            self._np_sin = np.array(self._sin)
+            self._np_speed = np.array([s['speed'] for s in streams])[:, None]
+            self._np_offset = np.array([s['offset'] for s in streams])[:, None]
+            self._np_amplitude = np.array([s['amplitude'] for s in streams])[:, None]
+
+    def stream_points(self, time):
+        if self.use_numpy:
+            t = time * self._np_speed + self._np_offset
+            radius = self.radius + self._np_amplitude * np.sin(np.radians(self._np_angles * self.waves + t))
+            points = np.empty((len(self.streams), len(self._angles), 2))
+            points[:, :, 0] = radius * self._np_cos
+            points[:, :, 1] = radius * self._np_sin
+            return points
+
+        streams = []
+        for stream in self.streams:
+            t = time * stream['speed'] + stream['offset']
+            points = []
+            for angle, cos_a, sin_a in zip(self._angles, self._cos, self._sin):
+                radius = self.radius + stream['amplitude'] * math.sin(math.radians(angle * self.waves + t))
+                points.append((radius * cos_a, radius * sin_a))
+            streams.append(points)
+        return streams
+
+    def polygons(self, time, center_x=0, center_y=0):
+        key = time % 360
+        polygons = self._table.get(key)
+        if polygons is None:
+            polygons = [_to_polygon(points) for points in self.stream_points(key)]
+            self._table[key] = polygons
+        if center_x or center_y:
+            offset = QPointF(center_x, center_y)
+            return [polygon.translated(offset) for polygon in polygons]
+        return polygons
+
+    def clear(self):
+        self._table.clear()
+
+
+def _to_polygon(points):
+    if np is not None and isinstance(points, np.ndarray):
+        count = len(points)
+        polygon = QPolygonF(count)
+        try:
+            # Write straight into the QPolygonF buffer instead of building QPointFs
+            buffer = polygon.data()
+            buffer.setsize(count * 2 * np.dtype(np.float64).itemsize)
+            np.frombuffer(buffer, dtype=np.float64).reshape(count, 2)[:] = points
+            return polygon
+        except (AttributeError, TypeError, ValueError):
+            points = points.tolist()
+    return QPolygonF([QPointF(x, y) for x, y in points])
@@ -0,0 +1,226 @@
+import math
+
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QPainter, QColor, QPen, QRadialGradient, QBrush
+
+from frame_pacing import QUALITY_LEVELS
+from sphere_geometry import RingGeometry, StreamGeometry
+
+# Scene descriptions. Colour channels are (base, pulse): base is scaled by the
+# state intensity, pulse by the layer's animated intensity. Plain ints are constant.
+
+ROBOT_SCENE = {
+    "radius": 80,
+    "states": {"idle": 1.0, "listening": 1.5, "processing": 1.2},
+    "glow": {
+        "radii": [300, 250, 200, 170, 140, 120],
+        "alpha": 80,
+        "alpha_step": 8,
+        "phase_step": 30,
+        "floor": 0.6,
+        "stops": [
+            (0, (90, 50), (140, 70), 255, 1),
+            (0.5, (60, 30), (100, 50), 220, 2),
+            (0.8, (30, 15), (60, 30), 180, 4),
+        ],
+    },
+    "core": [(0, (0, 0, 0), 255), (0.8, (10, 20, 40), 200), (1, (20, 40, 80), 150)],
+    "paths": {
+        "kind": "rings",
+        "radius_offset": 30,
+        "count": 8,
+        "step": 3,
+        "flatten": 0.3,
+        "spacing": 22.5,
+        "speed": 0.5,
+        "pulse_speed": 1,
+        "phase_step": 45,
+        "alpha": (100, 100),
+        "pens": [
+            {"rgb": (80, 150, 255), "alpha_div": 3, "width": 8},
+            {"rgb": (150, 200, 255), "alpha_div": 1, "width": 3},
+        ],
+    },
+    "rim": {"offset": 15},
+}
+
+PLASMA_SCENE = {
+    "radius": 120,
+    "states": {"idle": 1.0},
+    "glow": {
+        "radii": [350, 300, 250, 200],
+        "alpha": 80,
+        "alpha_step": 15,
+        "phase_step": 30,
+        "floor": 0.7,
+        "stops": [
+            (0, (80, 40), (120, 60), 255, 1),
+            (0.6, (40, 20), (80, 40), 200, 2),
+        ],
+    },
+    "core": [(0, (0, 0, 0), 255), (0.8, (10, 20, 40), 200), (1, (20, 40, 80), 150)],
+    "paths": {
+        "kind": "streams",
+        "radius_offset": 20,
+        "count": 6,
+        "step": 5,
+        "streams": [{"offset": i * 60, "speed": 1.5 + i * 0.2, "amplitude": 15 + i * 3} for i in range(6)],
+        "pulse_speed": 2,
+        "phase_step": 60,
+        "pens": [
+            {"rgb": (30, 60, (100, 155)), "alpha": 40, "width": 15},
+            {"rgb": (50, 100, (100, 155)), "alpha": 100, "width": 8},
+            {"rgb": ((200, 55), (200, 55), 255), "alpha": 220, "width": 2},
+        ],
+    },
+    "rim": {"offset": 20},
+}
+
+RIM_STOPS = [
+    (0.92, (120, 60), (180, 75), 255, (180, 70)),
+    (1, (220, 35), (240, 15), 255, (200, 55)),
+]
+
+
+def channel(spec, pulse, scale=1.0):
+    if isinstance(spec, tuple):
+        # The listening boost can push bright channels past 255
+        return min(255, int(spec[0] * scale + spec[1] * pulse))
+    return spec
+
+
+class SphereRenderer:
+    """Paints a sphere scene, reusing gradients, pens and geometry across frames.
+
+    Gradients, pens and colours are built once per scene (gradient centres and
+    rectangles again on resize); a frame only writes the time-dependent colours
+    into them before drawing.
+    """
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.radius = scene["radius"]
+        self.glow = scene["glow"]
+        self.paths = scene["paths"]
+        self.size = None
+
+        self.glow_gradients = [QRadialGradient(0, 0, r) for r in self.glow["radii"]]
+        for gradient in self.glow_gradients:
+            gradient.setColorAt(1, QColor(0, 0, 0, 0))
+        self.glow_rects = [QRectF() for _ in self.glow["radii"]]
+
+        self.core_gradient = QRadialGradient(0, 0, self.radius)
+        self.core_rect = QRectF()
+
+        self.rim_radius = self.radius + scene["rim"]["offset"]
+        self.rim_gradient = QRadialGradient(0, 0, self.rim_radius)
+        self.rim_gradient.setColorAt(0.8, QColor(0, 0, 0, 0))
+        self.rim_rect = QRectF()
+
+        self.color = QColor()
+        self.pens = [QPen(QColor(), pen["width"]) for pen in self.paths["pens"]]
+        self.geometries = {}
+
+    def geometry(self, step):
+        geometry = self.geometries.get(step)
+        if geometry is None:
+            paths = self.paths
+            if paths["kind"] == "rings":
+                geometry = RingGeometry(self.radius + paths["radius_offset"], paths["count"], step,
+                                        paths["flatten"], paths["spacing"], paths["speed"])
+            else:
+                geometry = StreamGeometry(self.radius + paths["radius_offset"], paths["streams"], step)
+            self.geometries[step] = geometry
+        return geometry
+
+    def resize(self, width, height):
+        if self.size == (width, height):
+            return
+        self.size = (width, height)
+        center_x = width // 2
+        center_y = height // 2
+        for gradient, rect, radius in zip(self.glow_gradients, self.glow_rects, self.glow["radii"]):
+            gradient.setCenter(center_x, center_y)
+            gradient.setFocalPoint(center_x, center_y)
+            rect.setRect(center_x - radius, center_y - radius, radius * 2, radius * 2)
+        for gradient, rect, radius in ((self.core_gradient, self.core_rect, self.radius),
+                                       (self.rim_gradient, self.rim_rect, self.rim_radius)):
+            gradient.setCenter(center_x, center_y)
+            gradient.setFocalPoint(center_x, center_y)
+            rect.setRect(center_x - radius, center_y - radius, radius * 2, radius * 2)
+
+    def extent(self):
+        """Half the side of the square, centred on the sphere, that the scene paints into."""
+        paths = self.paths
+        reach = self.radius + paths["radius_offset"] + max(pen["width"] for pen in paths["pens"])
+        reach += max((stream["amplitude"] for stream in paths.get("streams", ())), default=0)
+        return max(self.glow["radii"] + [self.rim_radius, reach])
+
+    def state_intensity(self, state):
+        return self.scene["states"].get(state, 1.0)
+
+    def paint(self, painter, width, height, time, state="idle", quality=QUALITY_LEVELS[0]):
+        self.resize(width, height)
+        base = self.state_intensity(state)
+        painter.setRenderHint(QPainter.Antialiasing, quality["antialias"])
+        painter.setPen(Qt.NoPen)
+        self.paint_glow(painter, time, base, quality)
+        self.paint_core(painter, base)
+        self.paint_paths(painter, width // 2, height // 2, time, base, quality)
+        self.paint_rim(painter, time, base)
+
+    def paint_glow(self, painter, time, base, quality):
+        glow = self.glow
+        layers = len(glow["radii"])
+        # Outermost layers are dropped first at lower quality
+        count = max(1, round(layers * quality["glow_fraction"]))
+        color = self.color
+        for i in range(layers - count, layers):
+            alpha = min(255, int((glow["alpha"] - i * glow["alpha_step"]) * base))
+            intensity = (math.sin(math.radians(time + i * glow["phase_step"])) + 1) / 2
+            glow_alpha = int(alpha * (glow["floor"] + (1 - glow["floor"]) * intensity))
+            gradient = self.glow_gradients[i]
+            for position, red, green, blue, alpha_div in glow["stops"]:
+                color.setRgb(channel(red, intensity, base), channel(green, intensity, base),
+                             channel(blue, intensity, base), glow_alpha // alpha_div)
+                gradient.setColorAt(position, color)
+            painter.setBrush(QBrush(gradient))
+            painter.drawEllipse(self.glow_rects[i])
+
+    def paint_core(self, painter, base):
+        color = self.color
+        for position, rgb, alpha in self.scene["core"]:
+            color.setRgb(int(rgb[0] * base), int(rgb[1] * base), int(rgb[2] * base), alpha)
+            self.core_gradient.setColorAt(position, color)
+        painter.setBrush(QBrush(self.core_gradient))
+        painter.drawEllipse(self.core_rect)
+
+    def paint_paths(self, painter, center_x, center_y, time, base, quality):
+        paths = self.paths
+        polygons = self.geometry(paths["step"] * quality["segment_scale"]).polygons(time, center_x, center_y)
+        painter.setBrush(Qt.NoBrush)
+        color = self.color
+        layer = paths.get("alpha")
+        layer_alpha = 255
+        for i, polygon in enumerate(polygons):
+            intensity = (math.sin(math.radians(time * paths["pulse_speed"] + i * paths["phase_step"])) + 1) / 2
+            if layer:
+                # Truncated once, as the original per-frame code did
+                layer_alpha = min(255, int((layer[0] + layer[1] * intensity) * base))
+            for pen, spec in zip(self.pens, paths["pens"]):
+                red, green, blue = spec["rgb"]
+                alpha = spec["alpha"] if "alpha" in spec else layer_alpha // spec["alpha_div"]
+                color.setRgb(channel(red, intensity), channel(green, intensity), channel(blue, intensity), alpha)
+                pen.setColor(color)
+                painter.setPen(pen)
+                painter.drawPolygon(polygon)
+        painter.setPen(Qt.NoPen)
+
+    def paint_rim(self, painter, time, base):
+        pulse = (math.sin(math.radians(time * 3)) + 1) / 2 * base
+        color = self.color
+        for position, red, green, blue, alpha in RIM_STOPS:
+            color.setRgb(channel(red, pulse), channel(green, pulse), channel(blue, pulse), channel(alpha, pulse))
+            self.rim_gradient.setColorAt(position, color)
+        painter.setBrush(QBrush(self.rim_gradient))
+        painter.drawEllipse(self.rim_rect)
@@ -0,0 +1,89 @@
+import sys
+import json
+import time
+import threading
+from concurrent.futures import Future
+
+
+class StartupTimer:
+    """Times cold-start phases against launch and reports time-to-ready.
+
+    Phases are logged to stderr as they finish; TWILIGHT_STARTUP_LOG=path
+    appends the full report as a JSON line once the assistant is ready.
+    """
+
+    def __init__(self, origin=None, path=None, stream=sys.stderr):
+        self.origin = origin if origin is not None else time.monotonic()
+        self.path = path
+        self.stream = stream
+        self.phases = []
+        self.ready_at = None
+        self.ready_event = threading.Event()
+        self.lock = threading.Lock()
+
+    def elapsed_ms(self, at=None):
+        return ((at if at is not None else time.monotonic()) - self.origin) * 1000
+
+    def add_phase(self, name, start, end, error=None):
+        phase = {"phase": name, "start_ms": round(self.elapsed_ms(start), 1),
+                 "duration_ms": round((end - start) * 1000, 1), "error": error}
+        with self.lock:
+            self.phases.append(phase)
+        if self.stream:
+            status = f"  !{error}" if error else ""
+            self.stream.write(f"startup {name:<12}{phase['duration_ms']:>9.1f} ms  "
+                              f"(+{self.elapsed_ms(end):.1f} ms){status}\n")
+            self.stream.flush()
+        return phase
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def background(self, name, fn, *args):
+        """Run ``fn`` as a timed phase on its own thread; returns a future for its result."""
+        future = Future()
+
+        def run():
+            try:
+                with self.phase(name):
+                    result = fn(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        threading.Thread(target=run, name=f"startup-{name}", daemon=True).start()
+        return future
+
+    def ready(self):
+        self.ready_at = time.monotonic()
+        self.ready_event.set()
+        if self.stream:
+            self.stream.write(f"startup time-to-ready {self.time_to_ready_ms():.1f} ms\n")
+            self.stream.flush()
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(dict(self.report(), time=time.time())) + "\n")
+
+    def time_to_ready_ms(self):
+        return round(self.elapsed_ms(self.ready_at), 1) if self.ready_at else None
+
+    def report(self):
+        with self.lock:
+            phases = sorted(self.phases, key=lambda p: p["start_ms"])
+        return {"time_to_ready_ms": self.time_to_ready_ms(), "phases": phases}
+
+
+class _Phase:
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timer.add_phase(self.name, self.start, time.monotonic(), exc_type.__name__ if exc_type else None)
+        return False
+
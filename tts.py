@@ -0,0 +1,378 @@
+import os
+import sys
+import io
+import wave
+import time
+import queue
+import shutil
+import hashlib
+import tempfile
+import threading
+import subprocess
+from collections import deque
+
+import instrumentation
+
+# Fixed replies used by the voice command dispatcher, synthesized ahead of time
+PHRASES = [
+    "Initializing twilight", "Yes", "What to search?", "Opening Google", "Opening anime",
+    "Opening Gemini", "Opening GitHub", "Opening Spotify", "Opening Netflix", "Opening Amazon",
+    "Opening Notion", "Opening TradingView", "Opening Chess", "Opening LinkedIn", "Opening WhatsApp",
+    "Taking screenshot", "Screenshot saved", "Screenshot failed", "Playing music", "Opening music",
+    "I am Twilight robot", "I am fine, thank you", "You're welcome", "Goodbye",
+]
+
+CACHE_DIR = os.path.join(os.getcwd(), "tts_cache")
+
+# Queued by warm() only to wake an idle worker
+_WARM = object()
+
+
+def clean_text(text):
+    clean = ''.join(c for c in text if c.isalnum() or c.isspace())
+    return ' '.join(clean.split())
+
+
+class SpeechBackend:
+    """Base class for TTS engines. Audio is exchanged as WAV bytes."""
+
+    name = "base"
+
+    def synthesize(self, text):
+        raise NotImplementedError
+
+    def play(self, audio):
+        raise NotImplementedError
+
+    def say(self, text):
+        self.play(self.synthesize(text))
+
+    def stop(self):
+        # Interrupt current playback; engines that cannot be interrupted just finish
+        pass
+
+    def close(self):
+        pass
+
+
+class PowerShellBackend(SpeechBackend):
+    """Windows System.Speech, kept alive in one powershell process instead of one per utterance."""
+
+    name = "powershell"
+
+    SCRIPT = (
+        "Add-Type -AssemblyName System.Speech; "
+        "$s = New-Object System.Speech.Synthesis.SpeechSynthesizer; "
+        "while (($line = [Console]::In.ReadLine()) -ne $null) { "
+        "$cmd, $arg, $text = $line.Split([char]9, 3); "
+        "if ($cmd -eq 'SAY') { $s.SetOutputToDefaultAudioDevice(); $s.Speak($text) } "
+        "elseif ($cmd -eq 'FILE') { $s.SetOutputToWaveFile($arg); $s.Speak($text); $s.SetOutputToNull() } "
+        "elseif ($cmd -eq 'PLAY') { (New-Object System.Media.SoundPlayer $arg).PlaySync() } "
+        "[Console]::Out.WriteLine('OK'); [Console]::Out.Flush() }"
+    )
+
+    def __init__(self):
+        self.process = None
+        self.lock = threading.Lock()
+
+    def _command(self, cmd, arg="", text=""):
+        with self.lock:
+            if self.process is None or self.process.poll() is not None:
+                self.process = subprocess.Popen(
+                    ['powershell', '-NoProfile', '-Command', self.SCRIPT],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                    text=True, bufsize=1)
+            self.process.stdin.write(f"{cmd}\t{arg}\t{clean_text(text)}\n")
+            self.process.stdin.flush()
+            if not self.process.stdout.readline():
+                raise RuntimeError("powershell speech process exited")
+
+    def synthesize(self, text):
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            self._command("FILE", path, text)
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(path)
+
+    def play(self, audio):
+        _play_via_file(audio, lambda path: self._command("PLAY", path))
+
+    def say(self, text):
+        self._command("SAY", text=text)
+
+    def stop(self):
+        # The next command starts a fresh process
+        process = self.process
+        if process is not None and process.poll() is None:
+            process.kill()
+
+    def close(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+            self.process = None
+
+
+class EspeakBackend(SpeechBackend):
+    """Local Linux stand-in using espeak/espeak-ng and aplay."""
+
+    name = "espeak"
+
+    def __init__(self, executable=None, player="aplay"):
+        self.executable = executable or shutil.which("espeak-ng") or shutil.which("espeak") or "espeak"
+        self.player = player
+        self.process = None
+
+    def synthesize(self, text):
+        result = subprocess.run([self.executable, '--stdout', clean_text(text)],
+                                check=True, capture_output=True)
+        return result.stdout
+
+    def play(self, audio):
+        self._run([self.player, '-q', '-'], audio)
+
+    def say(self, text):
+        self._run([self.executable, clean_text(text)])
+
+    def stop(self):
+        process = self.process
+        if process is not None and process.poll() is None:
+            process.kill()
+
+    def _run(self, cmd, audio=None):
+        self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE if audio else subprocess.DEVNULL,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.process.communicate(audio)
+        self.process = None
+
+
+class FileBackend(SpeechBackend):
+    """Stub engine that writes silent WAVs sized to the text and "plays" them by sleeping."""
+
+    name = "file"
+
+    def __init__(self, output_dir=None, seconds_per_word=0.0, sample_rate=16000):
+        self.output_dir = output_dir
+        self.seconds_per_word = seconds_per_word
+        self.sample_rate = sample_rate
+        self.spoken = []
+        self.interrupted = threading.Event()
+
+    def synthesize(self, text):
+        words = len(clean_text(text).split())
+        frames = int(self.sample_rate * self.seconds_per_word * words)
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(self.sample_rate)
+            w.writeframes(b"\x00\x00" * frames)
+        audio = buffer.getvalue()
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(os.path.join(self.output_dir, _cache_name(self.name, text)), "wb") as f:
+                f.write(audio)
+        return audio
+
+    def play(self, audio):
+        with wave.open(io.BytesIO(audio), "rb") as w:
+            duration = w.getnframes() / float(w.getframerate())
+        self.spoken.append(audio)
+        self.interrupted.clear()
+        if duration:
+            self.interrupted.wait(duration)
+
+    def stop(self):
+        self.interrupted.set()
+
+
+def default_backend():
+    choice = os.environ.get("TWILIGHT_TTS_BACKEND")
+    if choice == "file" or (choice is None and sys.platform != "win32"
+                            and not (shutil.which("espeak-ng") or shutil.which("espeak"))):
+        return FileBackend()
+    if choice == "espeak" or (choice is None and sys.platform != "win32"):
+        return EspeakBackend()
+    return PowerShellBackend()
+
+
+class PhraseCache:
+    """Memory and disk cache of synthesized audio, keyed by backend and cleaned text."""
+
+    def __init__(self, backend, cache_dir=CACHE_DIR):
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.memory = {}
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, text):
+        return os.path.join(self.cache_dir, _cache_name(self.backend.name, text))
+
+    def get(self, text):
+        key = clean_text(text)
+        audio = self.memory.get(key)
+        if audio is None and self.cache_dir and os.path.exists(self.path(key)):
+            with open(self.path(key), "rb") as f:
+                audio = f.read()
+            self.memory[key] = audio
+        if audio is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return audio
+
+    def add(self, text):
+        key = clean_text(text)
+        audio = self.memory.get(key)
+        if audio is not None:
+            return audio
+        if self.cache_dir and os.path.exists(self.path(key)):
+            with open(self.path(key), "rb") as f:
+                audio = f.read()
+        else:
+            audio = self.backend.synthesize(key)
+            if self.cache_dir:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(self.path(key), "wb") as f:
+                    f.write(audio)
+        self.memory[key] = audio
+        return audio
+
+
+class SpeechHandle:
+    def __init__(self, text):
+        self.text = text
+        self.event = threading.Event()
+        self.cancelled = False
+        self.error = None
+        self.queued = time.monotonic()
+        self.started = None
+        self.generation = 0
+
+    def done(self):
+        return self.event.is_set()
+
+    def wait(self, timeout=None):
+        return self.event.wait(timeout)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class SpeechWorker:
+    """Long-lived speech thread fed through a queue."""
+
+    def __init__(self, backend=None, phrases=PHRASES, cache_dir=CACHE_DIR, max_pending=16):
+        self.backend = backend or default_backend()
+        self.cache = PhraseCache(self.backend, cache_dir)
+        self.phrases = list(phrases)
+        self.jobs = queue.Queue(maxsize=max_pending)
+        self.warm_pending = deque()
+        # Bumped by interrupt(); jobs queued before that are dropped
+        self.generation = 0
+        self.current = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def say(self, text, wait=True):
+        handle = SpeechHandle(text)
+        handle.generation = self.generation
+        self.jobs.put(handle)
+        if wait:
+            handle.wait()
+        return handle
+
+    def say_stream(self, sentences, wait=True):
+        """Queue sentences as they arrive so playback starts before the text is complete."""
+        generation = self.generation
+        handles = []
+        for sentence in sentences:
+            if self.generation != generation:
+                break
+            handles.append(self.say(sentence, wait=False))
+        if wait and handles:
+            handles[-1].wait()
+        return handles
+
+    def warm(self, phrases=None):
+        # Synthesized one phrase at a time on the worker thread, only while no speech is queued
+        self.warm_pending.extend(phrases or self.phrases)
+        try:
+            self.jobs.put_nowait(_WARM)
+        except queue.Full:
+            pass
+
+    def busy(self):
+        return self.current is not None or not self.jobs.empty()
+
+    def interrupt(self):
+        """Barge-in: drop queued speech and cut off the utterance being played."""
+        self.generation += 1
+        self.cancel_pending()
+        if self.current is not None:
+            self.current.cancel()
+            self.backend.stop()
+
+    def cancel_pending(self):
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(job, SpeechHandle):
+                job.cancel()
+                job.event.set()
+
+    def stop(self):
+        self.jobs.put(None)
+        self.thread.join(timeout=5)
+        self.backend.close()
+
+    def _run(self):
+        while True:
+            if self.warm_pending and self.jobs.empty():
+                try:
+                    self.cache.add(self.warm_pending.popleft())
+                except Exception:
+                    pass
+                continue
+            job = self.jobs.get()
+            if job is None:
+                return
+            if job is _WARM:
+                continue
+            self.current = job
+            try:
+                if not job.cancelled and job.generation == self.generation:
+                    job.started = time.monotonic()
+                    audio = self.cache.get(job.text)
+                    if audio is not None:
+                        self.backend.play(audio)
+                    else:
+                        self.backend.say(job.text)
+            except Exception as e:
+                if not job.cancelled:
+                    job.error = e
+                    instrumentation.record_error("tts", e)
+            finally:
+                self.current = None
+                job.event.set()
+
+
+def _cache_name(backend_name, text):
+    digest = hashlib.sha1(f"{backend_name}:{clean_text(text)}".encode("utf-8")).hexdigest()
+    return f"{digest[:20]}.wav"
+
+
+def _play_via_file(audio, play_path):
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(audio)
+        play_path(path)
+    finally:
+        os.remove(path)